@@ -1,12 +1,57 @@
-from flask import Flask, render_template, request
+from flask import Flask, render_template, request, jsonify, g
 import os
+import time
 import numpy as np
-import pandas as pd
+from concurrent.futures import TimeoutError as ResultTimeout
+from end_to_end_project import logger, setup_logging
+from end_to_end_project.config.configuration import ConfigurationManager
 from end_to_end_project.pipeline.prediction import PredictionPipeline
+from end_to_end_project.pipeline.model_registry import get_model_registry
+from end_to_end_project.pipeline.micro_batching import get_micro_batcher
+from end_to_end_project.pipeline.serving_metrics import serving_metrics, CONTENT_TYPE
 
 
+setup_logging(ConfigurationManager().get_logging_config())
 app = Flask(__name__)
 
+# load the model once at startup, requests reuse it and pick up new versions via the registry
+get_model_registry().load()
+
+# form fields of the /predict page, in model feature order
+FORM_FIELDS = ['fixed_acidity', 'volatile_acidity', 'citric_acid', 'residual_sugar', 'chlorides', 'free_sulfur_dioxide',
+               'total_sulfur_dioxide', 'density', 'pH', 'sulphates', 'alcohol']
+
+
+def _route() -> str:
+    # the URL rule, not the path, so unknown paths don't each become a label
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request(response):
+    start = g.get('request_start')
+    if start is not None:
+        serving_metrics.observe_request(_route(), request.method, response.status_code, time.perf_counter() - start)
+    return response
+
+
+@app.teardown_request
+def record_unhandled_error(error):
+    # Flask has already logged the traceback
+    if error is not None:
+        serving_metrics.count_error(_route(), type(error).__name__)
+
+
+@app.route('/metrics', methods=['GET']) # Prometheus scrape endpoint
+def metrics():
+    return serving_metrics.render(), 200, {'Content-Type': CONTENT_TYPE}
+
+
 @app.route('/', methods=['GET'])
 def homepage():
     return render_template('index.html')
@@ -17,46 +62,63 @@ def index():
     if request.method == 'POST':
         try:
             #  reading the inputs given by the user
-            fixed_acidity =float(request.form['fixed_acidity'])
-            volatile_acidity =float(request.form['volatile_acidity'])
-            citric_acid =float(request.form['citric_acid'])
-            residual_sugar =float(request.form['residual_sugar'])
-            chlorides =float(request.form['chlorides'])
-            free_sulfur_dioxide =float(request.form['free_sulfur_dioxide'])
-            total_sulfur_dioxide =float(request.form['total_sulfur_dioxide'])
-            density =float(request.form['density'])
-            pH =float(request.form['pH'])
-            sulphates =float(request.form['sulphates'])
-            alcohol =float(request.form['alcohol'])
-       
-         
-            data = [fixed_acidity,volatile_acidity,citric_acid,residual_sugar,chlorides,free_sulfur_dioxide,total_sulfur_dioxide,density,pH,sulphates,alcohol]
-            data = np.array(data).reshape(1, 11)
-            
-            obj = PredictionPipeline()
-            predict = obj.predict(data)
-
-            return render_template('result.html', 
-                                 prediction = float(predict[0]),
-                                 fixed_acidity = fixed_acidity,
-                                 volatile_acidity = volatile_acidity,
-                                 citric_acid = citric_acid,
-                                 residual_sugar = residual_sugar,
-                                 chlorides = chlorides,
-                                 free_sulfur_dioxide = free_sulfur_dioxide,
-                                 total_sulfur_dioxide = total_sulfur_dioxide,
-                                 density = density,
-                                 pH = pH,
-                                 sulphates = sulphates,
-                                 alcohol = alcohol)
+            with serving_metrics.phase('/predict', 'parse'):
+                inputs = {field: float(request.form[field]) for field in FORM_FIELDS}
+                data = np.array(list(inputs.values())).reshape(1, 11)
+        except (KeyError, ValueError) as e:
+            logger.warning(f'Invalid /predict input: {e!r}')
+            serving_metrics.count_error('/predict', 'invalid_input')
+            return 'something is wrong', 400
 
+        try:
+            with serving_metrics.phase('/predict', 'model'):
+                registry_config = get_model_registry().config
+                if registry_config.micro_batching:
+                    predict = [get_micro_batcher(registry_config).predict(data, timeout=registry_config.micro_batch_timeout_s)]
+                else:
+                    obj = PredictionPipeline()
+                    predict = obj.predict(data)
+        except ResultTimeout:
+            logger.error(f'/predict timed out waiting for the micro-batcher to score {inputs}')
+            serving_metrics.count_error('/predict', 'timeout')
+            return 'something is wrong', 503
         except Exception as e:
-            print('The Exception message is: ',e)
-            return 'something is wrong'
+            logger.exception(f'/predict failed to score {inputs}: {e}')
+            serving_metrics.count_error('/predict', type(e).__name__)
+            return 'something is wrong', 500
+
+        with serving_metrics.phase('/predict', 'render'):
+            return render_template('result.html', prediction = float(predict[0]), **inputs)
 
     else:
         return render_template('index.html')
-    
+
+
+@app.route('/predict/batch', methods=['POST']) # JSON API for scoring many wines in one call
+def predict_batch():
+    with serving_metrics.phase('/predict/batch', 'parse'):
+        payload = request.get_json(silent=True)
+        records = payload.get('records') if isinstance(payload, dict) else payload
+        if not isinstance(records, list):
+            serving_metrics.count_error('/predict/batch', 'invalid_payload')
+            return jsonify(error='expected a JSON list of records or {"records": [...]}'), 400
+
+        max_batch_size = get_model_registry().config.max_batch_size
+        if len(records) > max_batch_size:
+            serving_metrics.count_error('/predict/batch', 'batch_too_large')
+            return jsonify(error=f'batch of {len(records)} records exceeds max_batch_size={max_batch_size}'), 413
+
+        obj = PredictionPipeline()
+        X, positions, errors = obj.validate_records(records)
+
+    with serving_metrics.phase('/predict/batch', 'model'):
+        predictions = obj.predict(X) if len(positions) > 0 else []
+
+    with serving_metrics.phase('/predict/batch', 'render'):
+        results = obj.merge_results(len(records), positions, predictions, errors)
+        return jsonify(model_version=obj.model_version, results=results)
+
+
 if __name__ == "__main__":
     port = int(os.environ.get('PORT', 8080))
     app.run(host="0.0.0.0", port=port, debug=True)
\ No newline at end of file
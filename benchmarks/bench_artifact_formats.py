@@ -0,0 +1,82 @@
+"""
+Load time and peak RSS of the transformation artifacts in each format.
+
+Every format is loaded in a fresh subprocess (the same `load_xy` call training
+and evaluation use, followed by a full pass over the features) so peak RSS is
+not polluted by the other runs. Run from the repository root:
+
+    python benchmarks/bench_artifact_formats.py --rows 2000000
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+import pandas as pd
+from end_to_end_project.utils.common import read_yaml
+from end_to_end_project.constants import SCHEMA_FILE_PATH
+from end_to_end_project.utils.data_io import save_dataset
+
+LOADER = """
+import sys, json, time
+
+
+def peak_rss_kb():
+    # VmHWM belongs to this process image; ru_maxrss would carry over the parent's peak through exec
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmHWM"))
+
+
+from end_to_end_project.utils.data_io import load_xy
+from end_to_end_project.utils.common import read_yaml
+from end_to_end_project.constants import SCHEMA_FILE_PATH
+schema = read_yaml(SCHEMA_FILE_PATH)
+baseline = peak_rss_kb()
+t0 = time.perf_counter()
+X, y = load_xy(sys.argv[1], schema.TARGET_COLUMN.name, schema.COLUMNS)
+open_seconds = time.perf_counter() - t0
+total = float(X.to_numpy().sum()) + float(y.to_numpy().sum())
+load_seconds = time.perf_counter() - t0
+peak = peak_rss_kb()
+print(json.dumps({"open_seconds": open_seconds, "load_and_scan_seconds": load_seconds,
+                  "peak_rss_mb": peak / 1024, "rss_increase_mb": (peak - baseline) / 1024}))
+"""
+
+VARIANTS = (("csv", False), ("parquet", False), ("feather", False), ("npy", False), ("npy", True))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--output", default="benchmarks/results/artifact_formats.json")
+    args = parser.parse_args()
+
+    schema = read_yaml(SCHEMA_FILE_PATH)
+    source = pd.read_csv("artifacts/data_ingestion/winequality-red.csv")
+    rng = np.random.default_rng(0)
+    df = source.sample(n=args.rows, replace=True, random_state=0).reset_index(drop=True)
+    numeric = df.columns.drop(schema.TARGET_COLUMN.name)
+    df[numeric] = df[numeric] * rng.normal(1.0, 0.01, size=(len(df), len(numeric)))
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt, float32 in VARIANTS:
+            path = os.path.join(tmp, f"{fmt}{'_f32' if float32 else ''}", "train.csv")
+            os.makedirs(os.path.dirname(path))
+            out = save_dataset(df, path, schema.TARGET_COLUMN.name, schema.COLUMNS, fmt=fmt, float32=float32)
+            size = sum(f.stat().st_size for f in out.rglob("*")) if out.is_dir() else out.stat().st_size
+            proc = subprocess.run([sys.executable, "-c", LOADER, path], capture_output=True, text=True, check=True)
+            result = {"format": fmt, "float32": float32, "bytes": size, **json.loads(proc.stdout.strip().splitlines()[-1])}
+            results.append(result)
+            print(f"{fmt:8} float32={str(float32):5}  {size / 1e6:8.1f} MB  open {result['open_seconds'] * 1000:8.1f} ms  "
+                  f"load+scan {result['load_and_scan_seconds'] * 1000:8.1f} ms  peak RSS +{result['rss_increase_mb']:.1f} MB")
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({"rows": args.rows, "results": results}, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
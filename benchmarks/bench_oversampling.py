@@ -0,0 +1,85 @@
+"""
+Time and peak memory of `handle_imbalenced`: imblearn SMOTE vs the chunked oversampler.
+
+Every (rows, method) pair runs in a fresh subprocess so peak RSS isn't shared
+between runs. Run from the repository root:
+
+    python benchmarks/bench_oversampling.py --rows 10000 100000 1000000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import numpy as np
+import pandas as pd
+from dataclasses import replace
+
+# method name -> data_transformation config overrides
+METHODS = {
+    "imblearn": {"oversampling": "imblearn"},
+    "chunked": {"oversampling": "chunked"},
+    "chunked_max_ratio_5": {"oversampling": "chunked", "oversampling_max_ratio": 5},
+}
+
+
+def peak_rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmHWM")) / 1024
+
+
+def make_train(rows: int, source: str = "artifacts/data_ingestion/winequality-red.csv") -> pd.DataFrame:
+    # bootstrap the real rows (keeps the class imbalance) with a little noise so every row is distinct
+    df = pd.read_csv(source)
+    rng = np.random.default_rng(0)
+    train = df.sample(n=rows, replace=True, random_state=0).reset_index(drop=True)
+    numeric = train.columns.drop("quality")
+    train[numeric] = train[numeric] * rng.normal(1.0, 0.01, size=(len(train), len(numeric)))
+    return train
+
+
+def run_one(rows: int, method: str) -> dict:
+    from end_to_end_project.config.configuration import ConfigurationManager
+    from end_to_end_project.components.data_transformation import DataTransformation
+
+    config = replace(ConfigurationManager().get_data_transformation_config(), **METHODS[method])
+    train = make_train(rows)
+    transformation = DataTransformation(df=train.iloc[:0], config=config)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    resampled = transformation.handle_imbalenced(train)
+    seconds = time.perf_counter() - start
+    return {"rows": rows, "method": method, "output_rows": len(resampled), "seconds": seconds,
+            "peak_rss_increase_mb": peak_rss_mb() - baseline}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--methods", nargs="+", default=list(METHODS), choices=list(METHODS))
+    parser.add_argument("--output", default="benchmarks/results/oversampling.json")
+    parser.add_argument("--run", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_one(int(args.run[0]), args.run[1])))
+        return
+
+    results = []
+    for rows in args.rows:
+        for method in args.methods:
+            proc = subprocess.run([sys.executable, __file__, "--run", str(rows), method],
+                                  capture_output=True, text=True, check=True)
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            results.append(result)
+            print(f"{rows:>9} rows  {method:20}  -> {result['output_rows']:>9} rows  "
+                  f"{result['seconds']:8.2f} s  peak RSS +{result['peak_rss_increase_mb']:.0f} MB")
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
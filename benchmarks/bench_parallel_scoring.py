@@ -0,0 +1,71 @@
+"""
+Rows/second of bulk scoring with 1..N worker processes.
+
+Run from the repository root after the pipeline has produced a model:
+
+    python benchmarks/bench_parallel_scoring.py --rows 2000000 --max-workers 8
+"""
+import os
+import json
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+from dataclasses import replace
+from end_to_end_project.config.configuration import ConfigurationManager
+from end_to_end_project.components.bulk_scoring import BulkScoring
+
+
+def make_input(path: str, rows: int, source: str = "artifacts/data_ingestion/winequality-red.csv"):
+    # tile the real data with a little noise so every row is distinct
+    df = pd.read_csv(source)
+    rng = np.random.default_rng(0)
+    reps = -(-rows // len(df))
+    big = pd.concat([df] * reps, ignore_index=True).iloc[:rows]
+    numeric = big.columns.drop("quality")
+    big[numeric] = big[numeric] * rng.normal(1.0, 0.01, size=(len(big), len(numeric)))
+    big.to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--output", default="benchmarks/results/parallel_scoring.json")
+    args = parser.parse_args()
+
+    config = ConfigurationManager()
+    bulk_config = config.get_bulk_scoring_config()
+    prediction_config = config.get_prediction_config()
+
+    worker_counts = sorted({1, *[2 ** i for i in range(1, 8) if 2 ** i <= args.max_workers], args.max_workers})
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "input.csv")
+        make_input(input_path, args.rows)
+        reference = None
+        for workers in worker_counts:
+            output_path = os.path.join(tmp, f"out_{workers}.csv")
+            scoring = BulkScoring(config=replace(bulk_config, workers=workers), predict_fn=None)
+            summary = scoring.score_files([input_path], output_path, workers=workers, prediction_config=prediction_config)
+            with open(output_path, "rb") as f:
+                content = f.read()
+            reference = reference or content
+            results.append({
+                "workers": workers,
+                "rows": summary["rows"],
+                "seconds": summary["seconds"],
+                "rows_per_second": summary["rows_per_second"],
+                "speedup": summary["rows_per_second"] / results[0]["rows_per_second"] if results else 1.0,
+                "identical_output": content == reference
+            })
+            print(f"workers={workers:>3}  {summary['rows_per_second']:>12,.0f} rows/s  "
+                  f"speedup x{results[-1]['speedup']:.2f}  identical={results[-1]['identical_output']}")
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({"rows": args.rows, "cpu_count": os.cpu_count(), "results": results}, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Time and memory of every pipeline stage and of `PredictionPipeline.predict`, across data scales.
+
+For each row count a synthetic dataset (`synthetic_data.py`, a Gaussian copula
+of the real CSV) is zipped into a workspace holding a copy of config/,
+params.yaml and schema.yaml, with `data_ingestion.source_url` pointing at the
+zip through a file:// URL. Each stage then runs in a fresh subprocess inside
+that workspace, so peak RSS belongs to that stage alone, and records wall
+time, CPU time (worker processes included) and peak RSS. Prediction is timed
+against the trained model at single-row and batch sizes.
+
+Results go to `benchmarks/results/pipeline_<commit>.json`; `--compare` prints
+the ratios against an earlier result file. Run from the repository root:
+
+    python benchmarks/bench_pipeline.py --rows 1000 100000 1000000
+    python benchmarks/bench_pipeline.py --rows 10000000 --set data_transformation.mode=out_of_core
+    python benchmarks/bench_pipeline.py --rows 100000 --compare benchmarks/results/pipeline_abc1234.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import zipfile
+import argparse
+import platform
+import resource
+import subprocess
+import warnings
+import numpy as np
+import yaml
+from pathlib import Path
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BATCH_SIZES = (1, 10, 100, 1_000, 10_000, 100_000)
+# pipeline stages, in run order
+STAGES = ("data_ingestion", "data_validation", "data_transformation", "model_training", "model_evaluation")
+
+
+def peak_rss_mb() -> float:
+    # VmHWM belongs to this process image; ru_maxrss would carry over the parent's peak through exec
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmHWM")) / 1024
+
+
+def cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def git_revision() -> dict:
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True).stdout.strip()
+    return {"commit": git("rev-parse", "--short", "HEAD") or "unknown", "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def apply_overrides(workspace: str, overrides: list):
+    """`section.key=value` pairs, written to config.yaml or params.yaml depending on where the section lives."""
+    paths = {name: os.path.join(workspace, name) for name in ("config/config.yaml", "params.yaml")}
+    documents = {name: yaml.safe_load(open(path)) for name, path in paths.items()}
+    for override in overrides:
+        key, value = override.split("=", 1)
+        section, field = key.split(".", 1)
+        name = "config/config.yaml" if section in documents["config/config.yaml"] else "params.yaml"
+        documents[name].setdefault(section, {})[field] = yaml.safe_load(value)
+    for name, path in paths.items():
+        with open(path, "w") as f:
+            yaml.safe_dump(documents[name], f, sort_keys=False)
+
+
+def make_workspace(workdir: str, rows: int, overrides: list) -> dict:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from synthetic_data import CopulaGenerator
+
+    workspace = os.path.abspath(os.path.join(workdir, str(rows)))
+    shutil.rmtree(workspace, ignore_errors=True)
+    os.makedirs(os.path.join(workspace, "source"))
+    shutil.copytree(os.path.join(REPO_ROOT, "config"), os.path.join(workspace, "config"))
+    for name in ("params.yaml", "schema.yaml"):
+        shutil.copy(os.path.join(REPO_ROOT, name), workspace)
+
+    start = time.perf_counter()
+    csv_path = os.path.join(workspace, "source", "winequality-red.csv")
+    CopulaGenerator.from_csv(os.path.join(REPO_ROOT, "artifacts/data_ingestion/winequality-red.csv")).write_csv(csv_path, rows)
+    zip_path = os.path.join(workspace, "source", "winequality-data.zip")
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.write(csv_path, "winequality-red.csv")
+    os.remove(csv_path)
+    seconds = time.perf_counter() - start
+
+    apply_overrides(workspace, [f"data_ingestion.source_url=file://{zip_path}"] + overrides)
+    return {"path": workspace, "generate_seconds": seconds, "zip_mb": os.path.getsize(zip_path) / 2**20}
+
+
+def run_stage(key: str) -> dict:
+    from end_to_end_project.pipeline.runner import STAGES as PIPELINE_STAGES
+    import importlib
+    stage = next(stage for stage in PIPELINE_STAGES if stage.key == key)
+    module_name, class_name = stage.pipeline.split(":")
+    start = time.perf_counter()
+    pipeline_class = getattr(importlib.import_module(module_name), class_name)
+    import_seconds = time.perf_counter() - start
+
+    baseline = peak_rss_mb()
+    cpu_start = cpu_seconds()
+    start = time.perf_counter()
+    pipeline_class().main()
+    return {
+        "seconds": time.perf_counter() - start,
+        "cpu_seconds": cpu_seconds() - cpu_start,
+        "import_seconds": import_seconds,
+        "peak_rss_mb": peak_rss_mb(),
+        "rss_increase_mb": peak_rss_mb() - baseline,
+        # worker processes (power transform, sweep, SMOTE) report their own peak
+        "children_peak_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    }
+
+
+def run_predict(batch_sizes: list, min_seconds: float = 0.5) -> list:
+    from end_to_end_project.pipeline.prediction import PredictionPipeline
+    from end_to_end_project.utils.data_io import load_xy, resolve_dataset_path
+    from end_to_end_project.config.configuration import ConfigurationManager
+    # the app hands predict plain arrays, which sklearn warns about for a model fitted on a DataFrame
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+    config = ConfigurationManager().get_model_evaluation_config()
+    X, _ = load_xy(resolve_dataset_path(Path(config.data_test_path)), config.target_col, config.all_schema)
+    X = np.ascontiguousarray(X.to_numpy(dtype=np.float64))
+    pipeline = PredictionPipeline()
+    results = []
+    for batch_size in batch_sizes:
+        # tile the test rows when the test split is smaller than the batch
+        batch = X[np.arange(batch_size) % len(X)]
+        pipeline.predict(batch)
+        timings = []
+        started = time.perf_counter()
+        while len(timings) < 5 or time.perf_counter() - started < min_seconds:
+            start = time.perf_counter()
+            pipeline.predict(batch)
+            timings.append(time.perf_counter() - start)
+        timings = np.array(timings)
+        results.append({
+            "batch_size": batch_size,
+            "calls": len(timings),
+            "p50_ms": float(np.percentile(timings, 50) * 1000),
+            "p95_ms": float(np.percentile(timings, 95) * 1000),
+            "rows_per_second": float(batch_size * len(timings) / timings.sum())
+        })
+    return results
+
+
+def subprocess_json(args: list, cwd: str) -> dict:
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), *args], cwd=cwd, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed in {cwd}:\n{proc.stderr[-3000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(base: dict, new: dict):
+    """Print new / base ratios of stage time, peak RSS and prediction throughput for the scales both files have."""
+    base_by_rows = {result["rows"]: result for result in base["results"]}
+    print(f"\n{new['meta']['commit']} vs {base['meta']['commit']} (ratio new / base, < 1 is faster or smaller)")
+    for result in new["results"]:
+        old = base_by_rows.get(result["rows"])
+        if old is None:
+            continue
+        for key, stage in result["stages"].items():
+            if key in old["stages"]:
+                print(f"{result['rows']:>9} rows  {key:20}  time x{stage['seconds'] / old['stages'][key]['seconds']:.2f}"
+                      f"  peak RSS x{stage['peak_rss_mb'] / old['stages'][key]['peak_rss_mb']:.2f}")
+        old_predict = {entry["batch_size"]: entry for entry in old.get("predict", [])}
+        for entry in result.get("predict", []):
+            if entry["batch_size"] in old_predict:
+                print(f"{result['rows']:>9} rows  predict batch {entry['batch_size']:<7}  p50 x"
+                      f"{entry['p50_ms'] / old_predict[entry['batch_size']]['p50_ms']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=list(STAGES))
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=list(BATCH_SIZES))
+    parser.add_argument("--set", dest="overrides", action="append", default=[],
+                        help="config.yaml / params.yaml override for the workspace, e.g. data_transformation.mode=out_of_core")
+    parser.add_argument("--workdir", default="benchmarks/results/work")
+    parser.add_argument("--keep-workdir", action="store_true")
+    parser.add_argument("--output", default=None, help="default: benchmarks/results/pipeline_<commit>.json")
+    parser.add_argument("--compare", default=None, help="earlier result file to compare against")
+    parser.add_argument("--run-stage", help=argparse.SUPPRESS)
+    parser.add_argument("--run-predict", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_stage:
+        print(json.dumps(run_stage(args.run_stage)))
+        return
+    if args.run_predict:
+        print(json.dumps(run_predict(args.batch_sizes)))
+        return
+
+    revision = git_revision()
+    meta = {**revision, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+            "platform": platform.platform(), "cpu_count": os.cpu_count(), "overrides": args.overrides}
+    results = []
+    for rows in args.rows:
+        workspace = make_workspace(args.workdir, rows, args.overrides)
+        result = {"rows": rows, "generate_seconds": workspace["generate_seconds"], "zip_mb": workspace["zip_mb"], "stages": {}}
+        print(f"{rows:>9} rows  generated in {workspace['generate_seconds']:.1f} s ({workspace['zip_mb']:.1f} MB zipped)")
+        for key in args.stages:
+            stage = subprocess_json(["--run-stage", key], cwd=workspace["path"])
+            result["stages"][key] = stage
+            print(f"{rows:>9} rows  {key:20}  {stage['seconds']:8.2f} s  cpu {stage['cpu_seconds']:8.2f} s  "
+                  f"peak RSS {stage['peak_rss_mb']:7.0f} MB (+{stage['rss_increase_mb']:.0f})")
+        if "model_training" in args.stages:
+            result["predict"] = subprocess_json(["--run-predict", "--batch-sizes", *map(str, args.batch_sizes)], cwd=workspace["path"])
+            for entry in result["predict"]:
+                print(f"{rows:>9} rows  predict batch {entry['batch_size']:<7}  p50 {entry['p50_ms']:8.3f} ms  "
+                      f"p95 {entry['p95_ms']:8.3f} ms  {entry['rows_per_second']:12.0f} rows/s")
+        results.append(result)
+        if not args.keep_workdir:
+            shutil.rmtree(workspace["path"], ignore_errors=True)
+
+    output = args.output or f"benchmarks/results/pipeline_{revision['commit']}{'-dirty' if revision['dirty'] else ''}.json"
+    report = {"meta": meta, "results": results}
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=4)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
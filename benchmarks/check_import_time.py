@@ -0,0 +1,86 @@
+"""
+Import-time budget of the package entry points, measured with `python -X importtime`.
+
+Every target is imported in a fresh interpreter `--repeat` times, and the
+fastest run is checked against the target's budget: the time spent importing
+it (its parent packages included, interpreter startup excluded) and the
+modules it must not pull in, such as pandas for the serving path or mlflow
+anywhere outside the tracking backend. Exits with status 1 when a target is
+over budget or imports a forbidden module, and prints the slowest imports of
+that target, so it can run in CI. Run from the repository root:
+
+    python benchmarks/check_import_time.py
+    python benchmarks/check_import_time.py --scale 2      # slower machine, double every budget
+"""
+import re
+import sys
+import argparse
+import subprocess
+
+# module: (budget in ms, modules it must not import)
+BUDGETS = {
+    # importing the package for its logger must stay close to a bare `import logging`
+    "end_to_end_project": (60, ("numpy", "yaml", "pandas")),
+    # main.py: the runner only hashes files, the stages import what they need when they run
+    "end_to_end_project.pipeline.runner": (450, ("pandas", "sklearn", "scipy", "joblib", "mlflow", "dagshub")),
+    # serving path used by app.py, the sklearn backend imports scikit-learn when it loads the model
+    "end_to_end_project.pipeline.prediction": (450, ("pandas", "sklearn", "scipy", "joblib", "mlflow", "dagshub")),
+    "end_to_end_project.pipeline.micro_batching": (450, ("pandas", "sklearn", "scipy", "joblib", "mlflow", "dagshub")),
+    "end_to_end_project.pipeline.serving_metrics": (60, ("numpy", "pandas")),
+    # mlflow and dagshub are only imported by the mlflow tracking backend
+    "end_to_end_project.pipeline.stage_05_model_evaluation": (2500, ("mlflow", "dagshub")),
+}
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def import_times(statement: str) -> list:
+    """(module, self us, cumulative us, depth) per import, in the order -X importtime reports them."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"`{statement}` failed:\n{proc.stderr[-2000:]}")
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def measure(module: str, startup: set) -> dict:
+    # top-level entries are the module and its parent packages, each with everything they imported
+    entries = [entry for entry in import_times(f"import {module}") if entry[0] not in startup]
+    return {
+        "ms": sum(cumulative for _, _, cumulative, depth in entries if depth == 0) / 1000,
+        "modules": {name for name, _, _, _ in entries},
+        "slowest": sorted(entries, key=lambda entry: entry[1], reverse=True)[:8]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5, help="imports per target, the fastest counts")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget, for slower machines")
+    parser.add_argument("modules", nargs="*", default=list(BUDGETS), help="targets to check (default: all)")
+    args = parser.parse_args()
+
+    # what the interpreter imports before running any code
+    startup = {entry[0] for entry in import_times("pass")}
+    failures = 0
+    for module in args.modules:
+        budget_ms, forbidden = BUDGETS.get(module, (float("inf"), ()))
+        budget_ms *= args.scale
+        result = min((measure(module, startup) for _ in range(args.repeat)), key=lambda result: result["ms"])
+        leaked = sorted(name for name in forbidden if name in result["modules"])
+        ok = result["ms"] <= budget_ms and not leaked
+        print(f"{'ok  ' if ok else 'FAIL'} {module:55} {result['ms']:8.1f} ms  (budget {budget_ms:.0f} ms)"
+              + (f"  imports {', '.join(leaked)}" if leaked else ""))
+        if not ok:
+            failures += 1
+            for name, self_us, cumulative_us, _ in result["slowest"]:
+                print(f"       {name:50} self {self_us / 1000:7.1f} ms  cumulative {cumulative_us / 1000:7.1f} ms")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,20 @@
-from end_to_end_project import logger
-from end_to_end_project.pipeline.stage_01_data_ingestion import DataIngestionPipeline
-from end_to_end_project.pipeline.stage_02_data_validation import DataValidationPipeline
-from end_to_end_project.pipeline.stage_03_data_transformation import DataTransformationPipeline
-from end_to_end_project.pipeline.stage_04_model_training import ModelTrainingPipeline
-from end_to_end_project.pipeline.stage_05_model_evaluation import ModelEvaluationPipeline
+import argparse
+from end_to_end_project import logger, setup_logging
+from end_to_end_project.config.configuration import ConfigurationManager
+from end_to_end_project.pipeline.runner import PipelineRunner, STAGES
 
 
-STAGE_NAME = "Data Ingestion Stage"
-try:
-    logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
-    obj = DataIngestionPipeline()
-    obj.main()
-    logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<")
-except Exception as e:
-    logger.exception(e)
-    raise e
+parser = argparse.ArgumentParser(description="Run the pipeline, skipping stages whose code, config and inputs are unchanged")
+parser.add_argument("--force", action="store_true", help="run every stage even if it is up to date")
+parser.add_argument("--from-stage", choices=[stage.key for stage in STAGES], default=None,
+                    help="run this stage and every stage after it even if they are up to date")
+parser.add_argument("--compare", action="store_true", help="compare the run report with the one of the previous run")
+args = parser.parse_args()
 
-STAGE_NAME = "Data Validation Stage"
-try:
-    logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
-    obj = DataValidationPipeline()
-    obj.main()
-    logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<")
-except Exception as e:
-    logger.exception(e)
-    raise e
+setup_logging(ConfigurationManager().get_logging_config())
 
-STAGE_NAME = "Data Transformation Stage"
-try:
-    logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
-    obj = DataTransformationPipeline()
-    obj.main()
-    logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<")
-except Exception as e:
-    logger.exception(e)
-    raise e
-
-STAGE_NAME = "Model Training Stage"
-try:
-    logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
-    obj = ModelTrainingPipeline()
-    obj.main()
-    logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<")
-except Exception as e:
-    logger.exception(e)
-    raise e
-
-STAGE_NAME = "Model Evaluation Stage"
-try:
-    logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
-    obj = ModelEvaluationPipeline()
-    obj.main()
-    logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<")
-except Exception as e:
-    logger.exception(e)
-    raise e
\ No newline at end of file
+runner = PipelineRunner()
+summary = runner.run(force=args.force, from_stage=args.from_stage)
+logger.info(f"Pipeline finished: {summary}")
+if args.compare:
+    runner.compare_with_previous()
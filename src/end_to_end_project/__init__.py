@@ -6,15 +6,40 @@ logging_str = "[%(asctime)s: %(levelname)s: %(module)s: %(message)s]"
 
 log_dir = "logs"
 log_filepath = os.path.join(log_dir, "running_logs.log")
-os.makedirs(log_dir, exist_ok=True)
-
-logging.basicConfig(
-    level = logging.INFO,
-    format = logging_str,
-    handlers = [
-        logging.FileHandler(log_filepath),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-
-logger = logging.getLogger("end_to_end_project")
\ No newline at end of file
+
+# importing the package configures nothing; entry points (main.py, app.py,
+# the stage and CLI modules) call setup_logging()
+logger = logging.getLogger("end_to_end_project")
+
+
+def setup_logging(config=None):
+    """
+    Configure the root logger once; later calls are no-ops
+
+    Args:
+        config (LoggingConfig, optional): the `logging` section of config.yaml.
+            Without it records go synchronously to logs/running_logs.log and stdout.
+    """
+    root = logging.getLogger()
+    if getattr(root, "_end_to_end_project_configured", False):
+        return
+    root._end_to_end_project_configured = True
+
+    if config is None:
+        os.makedirs(log_dir, exist_ok=True)
+        logging.basicConfig(
+            level = logging.INFO,
+            format = logging_str,
+            handlers = [
+                logging.FileHandler(log_filepath),
+                logging.StreamHandler(sys.stdout)
+            ]
+        )
+        return
+
+    from end_to_end_project.utils.log_handlers import build_handlers, start_queue_logging
+    handlers = build_handlers(str(config.log_file), fmt=config.format, max_bytes=config.max_bytes,
+                              backup_count=config.backup_count, rotate_when=config.rotate_when, text_format=logging_str)
+    if config.queue:
+        handlers = [start_queue_logging(handlers, queue_size=config.queue_size, full_policy=config.full_policy)]
+    logging.basicConfig(level=config.level, handlers=handlers)
@@ -0,0 +1,417 @@
+import io
+import os
+import json
+import math
+import time
+import shutil
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, Optional
+from end_to_end_project import logger
+from end_to_end_project.entity.config_entity import BulkScoringConfig, PredictionConfig
+from end_to_end_project.pipeline.model_registry import ModelRegistry
+from end_to_end_project.pipeline.prediction import PredictionPipeline
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+# CSV inputs are cut into line-aligned byte ranges of about this size (at least a few per worker)
+TARGET_RANGE_BYTES = 64 << 20
+
+
+def is_parquet(path: Path) -> bool:
+    return Path(path).suffix.lower() in PARQUET_SUFFIXES
+
+
+def prepare_parquet_output(output_path: Path, fresh: bool):
+    """Create the part directory of a Parquet output; a fresh run first removes what an earlier run left in it."""
+    if fresh and output_path.exists():
+        logger.info(f"Removing the previous output {output_path}")
+        shutil.rmtree(output_path)
+    os.makedirs(output_path, exist_ok=True)
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of bytes [start, end) of a file, so pandas can parse one slice of a CSV."""
+
+    def __init__(self, path: Path, start: int, end: int):
+        self._f = open(path, "rb")
+        self._f.seek(start)
+        self._remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = min(len(buffer), self._remaining)
+        if n <= 0:
+            return 0
+        data = self._f.read(n)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self._f.close()
+        super().close()
+
+
+# per-process scorer used by the pool workers, built once by _init_worker
+_worker_scoring = None
+
+
+def _init_worker(config: BulkScoringConfig, prediction_config: PredictionConfig):
+    global _worker_scoring
+    model = ModelRegistry(config=prediction_config).load().model
+    prediction = PredictionPipeline(model=model, feature_columns=config.feature_columns)
+    _worker_scoring = BulkScoring(config=config, predict_fn=prediction.predict)
+
+
+def _score_task(task: dict) -> dict:
+    return _worker_scoring.score_task(task)
+
+
+class BulkScoring:
+    """
+    Score a CSV/Parquet file of any size in fixed-size chunks.
+
+    Only one chunk is in memory at a time, predictions are appended to the
+    output as soon as a chunk is scored and a small checkpoint file records
+    how far we got, so a crashed run can `resume` from the last finished chunk.
+    CSV output is a single file; Parquet output is a directory of part files.
+
+    `score_files` is the multi-core variant: the inputs are cut into tasks
+    (line-aligned byte ranges of CSV files, row groups of Parquet files) that
+    a process pool scores into part files, and the parts are stitched into the
+    output strictly in task order so the result does not depend on scheduling.
+    CSV range splitting assumes no quoted newlines, which holds for numeric data.
+    """
+
+    def __init__(self, config: BulkScoringConfig, predict_fn: Callable[[np.ndarray], np.ndarray]):
+        self.config = config
+        self.predict_fn = predict_fn
+
+    def checkpoint_path(self, output_path: Path) -> Path:
+        output_path = Path(output_path)
+        return output_path.with_name(output_path.name + ".checkpoint.json")
+
+    def input_columns(self, input_path: Path) -> list:
+        if is_parquet(input_path):
+            import pyarrow.parquet as pq
+            return pq.ParquetFile(input_path).schema_arrow.names
+        return list(pd.read_csv(input_path, nrows=0).columns)
+
+    def validate_columns(self, input_path: Path, keep_columns: list):
+        columns = self.input_columns(input_path)
+        missing = [col for col in self.config.feature_columns + keep_columns if col not in columns]
+        if missing:
+            raise ValueError(f"Input {input_path} is missing columns: {missing}")
+
+    def read_chunks(self, input_path: Path, columns: list, skip_chunks: int = 0) -> Iterator[pd.DataFrame]:
+        chunk_size = self.config.chunk_size
+        if is_parquet(input_path):
+            import pyarrow.parquet as pq
+            batches = pq.ParquetFile(input_path).iter_batches(batch_size=chunk_size, columns=columns)
+            for i, batch in enumerate(batches):
+                if i >= skip_chunks:
+                    yield batch.to_pandas()
+        else:
+            # skipped rows are still scanned but never parsed into frames; a callable,
+            # since pandas turns a range into a set of every skipped row number
+            skiprows = (lambda i, n=skip_chunks * chunk_size: 0 < i <= n) if skip_chunks else None
+            yield from pd.read_csv(input_path, usecols=columns, chunksize=chunk_size, skiprows=skiprows)
+
+    def score_chunk(self, chunk: pd.DataFrame) -> np.ndarray:
+        X = chunk[self.config.feature_columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+        valid = np.isfinite(X).all(axis=1)
+        predictions = np.full(len(X), np.nan)
+        if valid.any():
+            predictions[valid] = self.predict_fn(X[valid])
+        return predictions
+
+    def _load_checkpoint(self, checkpoint_path: Path, identity: dict) -> dict:
+        with open(checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if checkpoint["identity"] != identity:
+            raise ValueError(f"Checkpoint {checkpoint_path} belongs to a different input or chunk size, "
+                             f"remove it or run without resume")
+        return checkpoint
+
+    def _output_intact(self, output_path: Path, checkpoint: dict) -> bool:
+        """Whether the output still holds everything the checkpoint says was written."""
+        if is_parquet(output_path):
+            return output_path.is_dir()
+        return output_path.is_file() and output_path.stat().st_size >= checkpoint["output_offset"]
+
+    def _save_checkpoint(self, checkpoint_path: Path, checkpoint: dict):
+        tmp_path = checkpoint_path.with_name(checkpoint_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, checkpoint_path)
+
+    def score_file(self, input_path: Path, output_path: Path, resume: bool = False, keep_columns: Optional[list] = None) -> dict:
+        input_path, output_path = Path(input_path), Path(output_path)
+        keep_columns = list(keep_columns or [])
+        self.validate_columns(input_path, keep_columns)
+
+        stat = os.stat(input_path)
+        identity = {
+            "input": str(input_path.resolve()),
+            "input_size": stat.st_size,
+            "input_mtime": stat.st_mtime,
+            "chunk_size": self.config.chunk_size
+        }
+        checkpoint_path = self.checkpoint_path(output_path)
+        checkpoint = {"identity": identity, "chunks_done": 0, "rows_done": 0, "invalid_rows": 0, "output_offset": 0}
+        if resume and checkpoint_path.exists():
+            resumed = self._load_checkpoint(checkpoint_path, identity)
+            if self._output_intact(output_path, resumed):
+                checkpoint = resumed
+                logger.info(f"Resuming bulk scoring after chunk {checkpoint['chunks_done']} ({checkpoint['rows_done']} rows)")
+            else:
+                logger.warning(f"Output {output_path} is missing or shorter than its checkpoint, scoring from the first chunk")
+
+        parquet_output = is_parquet(output_path)
+        if parquet_output:
+            # parts of an earlier, longer run would otherwise end up in the dataset
+            prepare_parquet_output(output_path, fresh=checkpoint["chunks_done"] == 0)
+            out = None
+        else:
+            out = open(output_path, "r+b" if checkpoint["chunks_done"] else "wb")
+            # drop anything written after the last checkpoint
+            out.truncate(checkpoint["output_offset"])
+            out.seek(checkpoint["output_offset"])
+
+        columns = list(dict.fromkeys(self.config.feature_columns + keep_columns))
+        start = time.perf_counter()
+        rows_this_run = 0
+        try:
+            for chunk in self.read_chunks(input_path, columns, skip_chunks=checkpoint["chunks_done"]):
+                predictions = self.score_chunk(chunk)
+                result = chunk[keep_columns].reset_index(drop=True)
+                result[self.config.prediction_column] = predictions
+
+                if parquet_output:
+                    part = output_path / f"part-{checkpoint['chunks_done']:05d}.parquet"
+                    tmp_part = part.with_name(part.name + ".tmp")
+                    result.to_parquet(tmp_part, index=False)
+                    os.replace(tmp_part, part)
+                else:
+                    result.to_csv(out, header=checkpoint["chunks_done"] == 0, index=False)
+                    out.flush()
+                    os.fsync(out.fileno())
+                    checkpoint["output_offset"] = out.tell()
+
+                checkpoint["chunks_done"] += 1
+                checkpoint["rows_done"] += len(chunk)
+                checkpoint["invalid_rows"] += int(np.isnan(predictions).sum())
+                rows_this_run += len(chunk)
+                self._save_checkpoint(checkpoint_path, checkpoint)
+
+                elapsed = time.perf_counter() - start
+                logger.info(f"Scored chunk {checkpoint['chunks_done']}: {checkpoint['rows_done']} rows total, "
+                            f"{rows_this_run / max(elapsed, 1e-9):,.0f} rows/s")
+        finally:
+            if out is not None:
+                out.close()
+
+        elapsed = time.perf_counter() - start
+        summary = {
+            "input": str(input_path),
+            "output": str(output_path),
+            "rows": checkpoint["rows_done"],
+            "invalid_rows": checkpoint["invalid_rows"],
+            "chunks": checkpoint["chunks_done"],
+            "seconds": elapsed,
+            "rows_per_second": rows_this_run / max(elapsed, 1e-9)
+        }
+        checkpoint_path.unlink(missing_ok=True)
+        logger.info(f"Bulk scoring finished: {summary}")
+        return summary
+
+    def plan_tasks(self, input_paths: list, workers: int) -> list:
+        tasks = []
+        for input_path in input_paths:
+            input_path = str(input_path)
+            if is_parquet(input_path):
+                import pyarrow.parquet as pq
+                for row_group in range(pq.ParquetFile(input_path).num_row_groups):
+                    tasks.append({"input": input_path, "row_group": row_group})
+                continue
+
+            size = os.path.getsize(input_path)
+            with open(input_path, "rb") as f:
+                header = f.readline()
+                data_start = len(header)
+                n_ranges = max(workers * 4, math.ceil((size - data_start) / TARGET_RANGE_BYTES), 1)
+                step = max((size - data_start) // n_ranges, 1)
+                bounds = [data_start]
+                for offset in range(data_start + step, size, step):
+                    f.seek(offset)
+                    f.readline()
+                    if f.tell() < size and f.tell() > bounds[-1]:
+                        bounds.append(f.tell())
+                bounds.append(size)
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                tasks.append({"input": input_path, "start": start, "end": end})
+
+        for i, task in enumerate(tasks):
+            task["index"] = i
+        return tasks
+
+    def read_task(self, task: dict, columns: list) -> Iterator[pd.DataFrame]:
+        if "row_group" in task:
+            import pyarrow.parquet as pq
+            batches = pq.ParquetFile(task["input"]).iter_batches(
+                batch_size=self.config.chunk_size, row_groups=[task["row_group"]], columns=columns)
+            for batch in batches:
+                yield batch.to_pandas()
+            return
+
+        names = self.input_columns(task["input"])
+        with io.BufferedReader(_ByteRange(task["input"], task["start"], task["end"]), buffer_size=1 << 20) as f:
+            yield from pd.read_csv(f, header=None, names=names, usecols=columns, chunksize=self.config.chunk_size)
+
+    def score_task(self, task: dict) -> dict:
+        columns = list(dict.fromkeys(self.config.feature_columns + task["keep_columns"]))
+        part, tmp_part = Path(task["part"]), Path(task["part"] + ".tmp")
+        rows, invalid_rows, writer = 0, 0, None
+        try:
+            if task["parquet_output"]:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            else:
+                writer = open(tmp_part, "wb")
+            for chunk in self.read_task(task, columns):
+                predictions = self.score_chunk(chunk)
+                result = chunk[task["keep_columns"]].reset_index(drop=True)
+                result[self.config.prediction_column] = predictions
+                if task["parquet_output"]:
+                    table = pa.Table.from_pandas(result, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(tmp_part, table.schema)
+                    writer.write_table(table)
+                else:
+                    result.to_csv(writer, header=False, index=False)
+                rows += len(chunk)
+                invalid_rows += int(np.isnan(predictions).sum())
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            # nothing to write for an empty parquet task: a part without the real
+            # column types would break reading the output as one dataset
+            return {"index": task["index"], "rows": 0, "invalid_rows": 0, "empty": True}
+        os.replace(tmp_part, part)
+        return {"index": task["index"], "rows": rows, "invalid_rows": invalid_rows, "empty": False}
+
+    def score_files(self, input_paths: list, output_path: Path, workers: int, prediction_config: PredictionConfig,
+                    resume: bool = False, keep_columns: Optional[list] = None) -> dict:
+        output_path = Path(output_path)
+        keep_columns = list(keep_columns or [])
+        for input_path in input_paths:
+            self.validate_columns(input_path, keep_columns)
+
+        identity = {
+            "inputs": [[str(Path(p).resolve()), os.path.getsize(p), os.path.getmtime(p)] for p in input_paths],
+            "chunk_size": self.config.chunk_size,
+            "keep_columns": keep_columns
+        }
+        checkpoint_path = self.checkpoint_path(output_path)
+        checkpoint = None
+        if resume and checkpoint_path.exists():
+            checkpoint = self._load_checkpoint(checkpoint_path, identity)
+            if self._output_intact(output_path, checkpoint):
+                logger.info(f"Resuming parallel bulk scoring after task {checkpoint['tasks_done']} of {len(checkpoint['tasks'])}")
+            else:
+                logger.warning(f"Output {output_path} is missing or shorter than its checkpoint, scoring from the first task")
+                checkpoint = None
+        if checkpoint is None:
+            # the plan is stored in the checkpoint so a resume with another worker count reuses it
+            checkpoint = {"identity": identity, "tasks": self.plan_tasks(input_paths, workers),
+                          "tasks_done": 0, "rows_done": 0, "invalid_rows": 0, "output_offset": 0}
+
+        parquet_output = is_parquet(output_path)
+        parts_dir = output_path.with_name(output_path.name + ".parts")
+        if checkpoint["tasks_done"] == 0 and parts_dir.exists() and not resume:
+            shutil.rmtree(parts_dir)
+        os.makedirs(parts_dir, exist_ok=True)
+        suffix = ".parquet" if parquet_output else ".csv"
+
+        pending = []
+        for task in checkpoint["tasks"][checkpoint["tasks_done"]:]:
+            task = {**task, "keep_columns": keep_columns, "parquet_output": parquet_output,
+                    "part": str(parts_dir / f"part-{task['index']:05d}{suffix}")}
+            pending.append(task)
+
+        if parquet_output:
+            prepare_parquet_output(output_path, fresh=checkpoint["tasks_done"] == 0)
+            out = None
+        else:
+            out = open(output_path, "r+b" if checkpoint["tasks_done"] else "wb")
+            out.truncate(checkpoint["output_offset"])
+            out.seek(checkpoint["output_offset"])
+            if checkpoint["tasks_done"] == 0:
+                out.write((",".join(keep_columns + [self.config.prediction_column]) + "\n").encode("utf-8"))
+
+        logger.info(f"Scoring {len(pending)} tasks from {len(input_paths)} file(s) with {workers} worker(s)")
+        start = time.perf_counter()
+        rows_this_run = 0
+        executor = None
+        try:
+            if workers > 1:
+                executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                               initargs=(self.config, prediction_config))
+                results = executor.map(_score_task, pending)
+            else:
+                if self.predict_fn is None:
+                    model = ModelRegistry(config=prediction_config).load().model
+                    self.predict_fn = PredictionPipeline(model=model, feature_columns=self.config.feature_columns).predict
+                results = map(self.score_task, pending)
+
+            # map yields in task order, so parts are stitched deterministically
+            for task, stats in zip(pending, results):
+                part = Path(task["part"])
+                if parquet_output:
+                    if not stats["empty"]:
+                        os.replace(part, output_path / f"part-{task['index']:05d}.parquet")
+                else:
+                    with open(part, "rb") as f:
+                        shutil.copyfileobj(f, out, length=1 << 20)
+                    out.flush()
+                    os.fsync(out.fileno())
+                    checkpoint["output_offset"] = out.tell()
+                    part.unlink()
+
+                checkpoint["tasks_done"] += 1
+                checkpoint["rows_done"] += stats["rows"]
+                checkpoint["invalid_rows"] += stats["invalid_rows"]
+                rows_this_run += stats["rows"]
+                self._save_checkpoint(checkpoint_path, checkpoint)
+
+                elapsed = time.perf_counter() - start
+                logger.info(f"Finished task {checkpoint['tasks_done']}/{len(checkpoint['tasks'])}: "
+                            f"{checkpoint['rows_done']} rows total, {rows_this_run / max(elapsed, 1e-9):,.0f} rows/s")
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            if out is not None:
+                out.close()
+
+        elapsed = time.perf_counter() - start
+        summary = {
+            "inputs": [str(p) for p in input_paths],
+            "output": str(output_path),
+            "workers": workers,
+            "rows": checkpoint["rows_done"],
+            "invalid_rows": checkpoint["invalid_rows"],
+            "tasks": checkpoint["tasks_done"],
+            "seconds": elapsed,
+            "rows_per_second": rows_this_run / max(elapsed, 1e-9)
+        }
+        shutil.rmtree(parts_dir, ignore_errors=True)
+        checkpoint_path.unlink(missing_ok=True)
+        logger.info(f"Bulk scoring finished: {summary}")
+        return summary
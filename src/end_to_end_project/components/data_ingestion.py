@@ -1,28 +1,218 @@
 import os
+import json
+import hashlib
+import http.client
 import urllib.request as request
+from urllib.error import HTTPError, URLError
 import zipfile
+from email.utils import formatdate
+from typing import Optional
 from end_to_end_project import logger
 from end_to_end_project.utils.common import get_size
+from end_to_end_project.utils.archive import member_signatures, extract_members
 from end_to_end_project.entity.config_entity import DataIngestionConfig
 from pathlib import Path
 
+BLOCK_SIZE = 1 << 20
+
+
+def _read_json(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_json(path: str, data: dict):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=4)
+    os.replace(tmp_path, path)
+
+
+def _strong_etag(etag):
+    # If-Range only accepts a strong validator (RFC 9110 13.1.5)
+    return etag if etag and not etag.startswith("W/") else None
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
 class DataIngestion:
+    """
+    Conditional, resumable download of the source archive.
+
+    Validators of the published copy (ETag, Last-Modified, sha256) live in a
+    `<local_data_file>.meta.json` sidecar and turn every run into a
+    conditional GET: an unchanged source answers 304 and costs one round
+    trip. A download streams into `<local_data_file>.part` while it is
+    hashed; if the transfer breaks, the next attempt asks for the rest with a
+    Range request (guarded by If-Range so a changed source starts over). Only
+    a complete, verified file is moved over the published one, atomically.
+    With a published copy and its sidecar on disk, an unreachable source costs
+    one short attempt (`fallback_timeout`) before the copy is used.
+    """
+
     def __init__(self, config: DataIngestionConfig):
         self.config = config
+        self.meta_path = f"{config.local_data_file}.meta.json"
+        self.part_path = f"{config.local_data_file}.part"
+        self.part_meta_path = f"{self.part_path}.json"
+
+    def download_file(self) -> bool:
+        """
+        Fetch the source if it changed
 
-    def download_file(self):
-        if not os.path.exists(self.config.local_data_file):
-            filename, headers = request.urlretrieve(
-                url = self.config.source_url,
-                filename = self.config.local_data_file
-            )
-            logger.info(f"Downloaded file: {filename} with following info: {headers}")
-        else:
-            logger.info(f"File already exists of size: {get_size(Path(self.config.local_data_file))}")
+        Returns:
+            bool: True when a new version was published
+        """
+        meta = self.local_meta()
+        # offline runs shouldn't sit through every retry when there is a copy to keep
+        fallback = bool(meta) and os.path.exists(self.meta_path)
+        retries = 1 if fallback else self.config.retries
+        timeout = min(self.config.fallback_timeout, self.config.timeout) if fallback else self.config.timeout
+        for attempt in range(1, retries + 1):
+            try:
+                return self.fetch(meta, timeout)
+            except (URLError, ConnectionError, TimeoutError, http.client.HTTPException) as e:
+                if isinstance(e, HTTPError) and e.code < 500:
+                    raise
+                logger.warning(f"Download attempt {attempt}/{retries} of {self.config.source_url} failed: {e}")
+
+        if os.path.exists(self.config.local_data_file):
+            logger.warning(f"Source unreachable, keeping the local copy of size: {get_size(Path(self.config.local_data_file))}")
+            return False
+        raise ConnectionError(f"Could not download {self.config.source_url} after {self.config.retries} attempts")
+
+    def local_meta(self) -> dict:
+        """Validators of the published copy, derived from the file itself when there is no sidecar yet."""
+        local = self.config.local_data_file
+        if not os.path.exists(local):
+            return {}
+        meta = _read_json(self.meta_path)
+        if meta.get("source_url") == self.config.source_url and meta.get("size") == os.path.getsize(local):
+            return meta
+        # a copy from before the sidecar existed: compare against its mtime and content
+        return {"last_modified": formatdate(os.path.getmtime(local), usegmt=True), "sha256": _file_sha256(local)}
+
+    def discard_part(self):
+        for path in (self.part_path, self.part_meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def fetch(self, meta: dict, timeout: Optional[float] = None) -> bool:
+        timeout = self.config.timeout if timeout is None else timeout
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        part = _read_json(self.part_meta_path)
+        offset = os.path.getsize(self.part_path) if os.path.exists(self.part_path) else 0
+        validator = _strong_etag(part.get("etag")) or part.get("last_modified")
+        if offset and validator and part.get("source_url") == self.config.source_url:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+
+        try:
+            response = request.urlopen(request.Request(self.config.source_url, headers=headers), timeout=timeout)
+        except HTTPError as e:
+            if e.code == 304:
+                logger.info(f"Source not modified, keeping {self.config.local_data_file}")
+                return False
+            if e.code == 416:
+                # the partial file doesn't fit the source any more
+                self.discard_part()
+                return self.fetch(meta, timeout)
+            raise
+
+        with response:
+            resumed = response.status == 206
+            if not resumed:
+                offset = 0
+            if resumed:
+                total = int(response.headers["Content-Range"].rsplit("/", 1)[-1])
+            else:
+                length = response.headers.get("Content-Length")
+                total = int(length) if length is not None else None
+            validators = {
+                "source_url": self.config.source_url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified")
+            }
+            _write_json(self.part_meta_path, validators)
+
+            digest = hashlib.sha256()
+            if resumed:
+                logger.info(f"Resuming download at byte {offset}")
+                with open(self.part_path, "rb") as f:
+                    for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+                        digest.update(block)
+            with open(self.part_path, "ab" if resumed else "wb") as f:
+                for block in iter(lambda: response.read(BLOCK_SIZE), b""):
+                    f.write(block)
+                    digest.update(block)
+
+        size = os.path.getsize(self.part_path)
+        if total is not None and size != total:
+            # keep the part, the next attempt resumes from here
+            raise ConnectionError(f"Transfer ended at {size} of {total} bytes")
+        sha256 = digest.hexdigest()
+        if self.config.sha256 and sha256 != self.config.sha256:
+            self.discard_part()
+            raise ValueError(f"Checksum mismatch for {self.config.source_url}: {sha256} != {self.config.sha256}")
+        if str(self.config.local_data_file).endswith(".zip") and not zipfile.is_zipfile(self.part_path):
+            self.discard_part()
+            raise ValueError(f"Downloaded file from {self.config.source_url} is not a valid zip archive")
+
+        # members extracted from the previous version are only re-extracted if their CRC changed
+        new_meta = {**validators, "sha256": sha256, "size": size, "extracted": meta.get("extracted", {})}
+        if sha256 == meta.get("sha256") and os.path.exists(self.config.local_data_file):
+            # the server ignored the conditional request but the content is the same
+            self.discard_part()
+            _write_json(self.meta_path, {**meta, **new_meta})
+            logger.info(f"Source content unchanged (sha256 {sha256[:12]}), keeping {self.config.local_data_file}")
+            return False
+
+        os.replace(self.part_path, self.config.local_data_file)
+        _write_json(self.meta_path, new_meta)
+        os.remove(self.part_meta_path)
+        logger.info(f"Downloaded {self.config.source_url} ({size} bytes, sha256 {sha256[:12]}) to {self.config.local_data_file}")
+        return True
 
     def extract_zip_file(self):
+        """
+        Extract the members whose CRC changed since the last extraction
+
+        With `extract: false` nothing is extracted, the downstream stages read
+        their member straight from the archive.
+        """
+        if not self.config.extract:
+            logger.info(f"Extraction disabled, downstream stages read from {self.config.local_data_file}")
+            return
         unzip_path = self.config.unzip_dir
-        os.makedirs(unzip_path, exist_ok=True)
-        with zipfile.ZipFile(self.config.local_data_file, 'r') as zip_ref:
-            zip_ref.extractall(unzip_path) 
-            logger.info(f"Extracted zip file to : {unzip_path}")
\ No newline at end of file
+        meta = _read_json(self.meta_path)
+        extracted = meta.get("extracted", {})
+        signatures = member_signatures(Path(self.config.local_data_file))
+        changed = [
+            name for name, signature in signatures.items()
+            if extracted.get(name) != signature or not os.path.exists(os.path.join(unzip_path, name))
+        ]
+        if not changed:
+            logger.info(f"All {len(signatures)} archive members unchanged since the last extraction, skipping")
+            return
+
+        extract_members(Path(self.config.local_data_file), changed, unzip_path)
+        logger.info(f"Extracted {len(changed)} of {len(signatures)} zip members to : {unzip_path}")
+        if not meta:
+            # offline, or a 304 against a copy from before the sidecar existed:
+            # record the copy's own validators so the signatures have somewhere to live
+            meta = {**self.local_meta(), "source_url": self.config.source_url,
+                    "size": os.path.getsize(self.config.local_data_file)}
+        _write_json(self.meta_path, {**meta, "extracted": signatures})
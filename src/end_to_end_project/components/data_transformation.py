@@ -2,16 +2,24 @@ import os
 import numpy as np
 from end_to_end_project import logger
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import PowerTransformer
 from imblearn.over_sampling import SMOTE
 import pandas as pd
 from end_to_end_project.entity.config_entity import DataTransformationConfig
+from end_to_end_project.components.preprocessor import Preprocessor, yeo_johnson
+from end_to_end_project.components.power_transform import column_skewness, fit_yeo_johnson_lambdas
+from end_to_end_project.components.outlier_capping import OutlierCapper
+from end_to_end_project.components.oversampling import ChunkedSMOTE
+from end_to_end_project.utils.data_io import put_dataset
+from end_to_end_project.utils.profiling import profiler, profiled
 
 class DataTransformation:
     def __init__(self, df: pd.DataFrame, config: DataTransformationConfig):
         self.config = config
         self.df = df.copy()
+        # fitted state of the steps below, saved next to train/test for serving
+        self.preprocessor = Preprocessor(feature_names=[col for col in self.df.columns if col != 'quality'])
 
+    @profiled()
     def clean_data(self) -> pd.DataFrame:
         # Remove rows with missing values
         self.df.dropna(inplace=True)
@@ -21,48 +29,61 @@ class DataTransformation:
         return self.df
     
 
+    @profiled()
     def data_split(self, test_size: float = 0.25, random_state:int = 42):
         train, test = train_test_split(self.df, test_size=test_size, random_state=random_state)
         return train.reset_index(drop=True), test.reset_index(drop=True)
 
+    @profiled()
     def handle_outliers(self, train: pd.DataFrame) -> pd.DataFrame:
         numeric_cols = train.select_dtypes(include=np.number).columns.drop('quality')
-        condition = pd.Series(True, index=train.index)
+        # all quartiles in one pass, then a single in-place clip of the whole block
+        values = train[numeric_cols].to_numpy(dtype=np.float64, copy=True)
+        capper = OutlierCapper().fit(values)
+        train[numeric_cols] = capper.transform(values)
 
-        for col in numeric_cols:
-            Q1 = train[col].quantile(0.25)
-            Q3 = train[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            # with iqr
-            # condition &= (train[col] >= lower_bound) & (train[col] <= upper_bound)
-            # with capping
-            train[col] = np.where(train[col] < lower_bound, lower_bound, train[col])
-            train[col] = np.where(train[col] > upper_bound, upper_bound, train[col])
-
-        # train = train[condition].reset_index(drop=True)
         train.reset_index(drop=True, inplace=True)
+        self.preprocessor.set_capping_bounds(capper.bounds(numeric_cols))
 
         return train
 
+    @profiled()
     def handle_skewness_normalize(self, train: pd.DataFrame, test: pd.DataFrame, skew_threshold: float = 1.0) -> pd.DataFrame:
         numeric_cols = train.select_dtypes(include=[np.number]).columns.drop('quality')
-        pt = PowerTransformer(method='yeo-johnson', standardize=True)
-        skewed_cols = [col for col in numeric_cols if abs(train[col].skew())>skew_threshold]
+        values = train[numeric_cols].to_numpy(dtype=np.float64)
+        skewed_idx = np.flatnonzero(np.abs(column_skewness(values)) > skew_threshold)
+        skewed_cols = numeric_cols[skewed_idx].tolist()
         if len(skewed_cols) > 0:
-            logger.info(f"Handling skewness for columns:")
-            train[skewed_cols] = pt.fit_transform(train[skewed_cols])
-            test[skewed_cols] = pt.transform(test[skewed_cols])
+            logger.info(f"Handling skewness for columns: {skewed_cols}")
+            # same lambdas and standardization as PowerTransformer(method='yeo-johnson'), columns fitted in parallel
+            lambdas = fit_yeo_johnson_lambdas(values[:, skewed_idx], n_jobs=self.config.power_n_jobs,
+                                              sample_size=self.config.power_sample_size,
+                                              tolerance=self.config.power_tolerance)
+            transformed = yeo_johnson(values[:, skewed_idx], lambdas)
+            mean = transformed.mean(axis=0)
+            scale = transformed.std(axis=0)
+            scale[scale < 10 * np.finfo(np.float64).eps] = 1.0
+            train[skewed_cols] = (transformed - mean) / scale
+            test[skewed_cols] = (yeo_johnson(test[skewed_cols].to_numpy(dtype=np.float64), lambdas) - mean) / scale
+            self.preprocessor.set_power_transform(skewed_cols, lambdas, mean, scale)
         else:
             logger.info("No skewed columns found, skipping normalization.")
 
         return train,test
     
+    @profiled()
     def handle_imbalenced(self, train: pd.DataFrame) -> pd.DataFrame:
         X = train.drop('quality', axis=1)
         y = train['quality']
 
+        if self.config.oversampling == "chunked":
+            smote = ChunkedSMOTE(max_ratio=self.config.oversampling_max_ratio, chunk_size=self.config.chunk_size,
+                                 n_jobs=self.config.oversampling_n_jobs, random_state=42)
+            X_resampled, y_resampled = smote.fit_resample(X.to_numpy(dtype=np.float64), y.to_numpy())
+            train = pd.DataFrame(X_resampled, columns=X.columns, copy=False)
+            train[y.name] = y_resampled
+            return train
+
         class_counts = y.value_counts()
         min_samples = class_counts.min()
 
@@ -76,10 +97,13 @@ class DataTransformation:
         train = pd.concat([pd.DataFrame(X_resampled, columns=X.columns), pd.Series(y_resampled, name=y.name)], axis=1)
         return train
     
+    @profiled()
     def make_result(self, train, test):
         # Save the processed train and test data
-        train.to_csv(os.path.join(self.config.root_dir, "train.csv"), index=False)
-        test.to_csv(os.path.join(self.config.root_dir, "test.csv"), index=False)
+        for name, df in (("train.csv", train), ("test.csv", test)):
+            put_dataset(df, os.path.join(self.config.root_dir, name), target='quality', schema=self.config.all_schema,
+                        fmt=self.config.artifact_format, float32=self.config.float32, export_csv=self.config.export_csv)
+        self.preprocessor.save(os.path.join(self.config.root_dir, self.config.preprocessor_name))
         
         logger.info(f"Processed train and test data saved at {self.config.root_dir}")
         logger.info(f"Train data shape: {train.shape}, Test data shape: {test.shape}")
@@ -87,6 +111,7 @@ class DataTransformation:
         return train, test
 
     def run_data_transformation(self, do_clean=True, do_split=True, do_outliers=True, do_skewness=True, do_imbalanced=True):
+        profiler.set_rows(rows_in=len(self.df))
         if do_clean == True:
             self.clean_data()
         if do_split == True:
@@ -97,4 +122,5 @@ class DataTransformation:
             train, test = self.handle_skewness_normalize(train, test)
         if do_imbalanced == True:
             train = self.handle_imbalenced(train)
-        self.make_result(train, test)
\ No newline at end of file
+        self.make_result(train, test)
+        profiler.set_rows(rows_out=len(train) + len(test))
\ No newline at end of file
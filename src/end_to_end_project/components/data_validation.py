@@ -1,33 +1,121 @@
 import os
+import yaml
+import numpy as np
 import pandas as pd
 from end_to_end_project import logger
 from end_to_end_project.entity.config_entity import DataValidationConfig
+from end_to_end_project.utils.archive import open_source
+from end_to_end_project.utils.profiling import profiler
 
 
 class DataValidation:
+    """
+    Single streaming pass over the raw CSV, checked against schema.yaml.
+
+    The header is checked for missing, unexpected and reordered columns, then
+    the file is read in `chunk_size` rows at a time and every chunk updates
+    per-column counters: nulls, values that can't be cast to the declared
+    dtype and values outside the schema RANGES. Rows holding a non-castable
+    value are appended to `invalid_rows_file`. Memory stays bounded by the
+    chunk size whatever the size of the input, and the status file is written
+    once at the end.
+    """
+
     def __init__(self, config: DataValidationConfig):
         self.config = config
 
-    def validate_all_columns(self):
+    def check_columns(self, columns: list) -> dict:
+        expected = list(self.config.all_schema.keys())
+        present = [col for col in columns if col in self.config.all_schema]
+        return {
+            "missing": [col for col in expected if col not in columns],
+            "unexpected": [col for col in columns if col not in self.config.all_schema],
+            "order_matches_schema": present == [col for col in expected if col in columns]
+        }
+
+    def check_chunk(self, chunk: pd.DataFrame, stats: dict) -> pd.Series:
+        """Update the per-column counters with one chunk, return the mask of its non-castable rows."""
+        invalid = np.zeros(len(chunk), dtype=bool)
+        for col, col_stats in stats.items():
+            values = chunk[col]
+            nulls = values.isna().to_numpy()
+            # the C parser already produced numbers unless some value didn't parse
+            numeric = values if pd.api.types.is_numeric_dtype(values) else pd.to_numeric(values, errors="coerce")
+            numeric = numeric.to_numpy(dtype=np.float64)
+            bad = np.isnan(numeric) & ~nulls
+            if col_stats["dtype"].startswith("int"):
+                with np.errstate(invalid="ignore"):
+                    bad |= ~np.isnan(numeric) & (numeric != np.floor(numeric))
+
+            valid = numeric[~np.isnan(numeric) & ~bad]
+            col_stats["nulls"] += int(nulls.sum())
+            col_stats["non_castable"] += int(bad.sum())
+            if len(valid):
+                col_stats["min"] = min(col_stats["min"], float(valid.min()))
+                col_stats["max"] = max(col_stats["max"], float(valid.max()))
+                if col in self.config.ranges:
+                    low, high = self.config.ranges[col]
+                    col_stats["out_of_range"] += int(((valid < low) | (valid > high)).sum())
+            invalid |= bad
+        return pd.Series(invalid, index=chunk.index)
+
+    def write_status(self, report: dict):
+        tmp_path = f"{self.config.STATUS_FILE}.tmp"
+        with open(tmp_path, "w") as f:
+            yaml.safe_dump(report, f, sort_keys=False)
+        os.replace(tmp_path, self.config.STATUS_FILE)
+
+    def validate_all_columns(self) -> bool:
         try:
-            validation_status = None
-
-            data = pd.read_csv(self.config.unzip_data_dir)
-            all_cols = list(data.columns)
-
-            all_schema = self.config.all_schema.keys()
-
-            for col in all_cols:
-                if col not in all_schema:
-                    validation_status = False
-                    with open(self.config.STATUS_FILE, "w") as f:
-                        f.write(f"Validation status: {validation_status}")
-                else:
-                    validation_status = True
-                    with open(self.config.STATUS_FILE, "w") as f:
-                        f.write(f"Validation status: {validation_status}")
-                
+            with open_source(self.config.unzip_data_dir) as source:
+                columns = list(pd.read_csv(source, nrows=0).columns)
+            column_report = self.check_columns(columns)
+            known = [col for col in columns if col in self.config.all_schema]
+
+            stats = {
+                col: {"dtype": str(self.config.all_schema[col]), "nulls": 0, "non_castable": 0,
+                      "out_of_range": 0, "min": float("inf"), "max": float("-inf")}
+                for col in known
+            }
+            rows = 0
+            invalid_rows = 0
+            examples = []
+            invalid_rows_file = self.config.invalid_rows_file
+            if os.path.exists(invalid_rows_file):
+                os.remove(invalid_rows_file)
+
+            with open_source(self.config.unzip_data_dir) as source:
+                for chunk in pd.read_csv(source, usecols=known, chunksize=self.config.chunk_size):
+                    rows += len(chunk)
+                    invalid = self.check_chunk(chunk, stats)
+                    if invalid.any():
+                        bad_rows = chunk[invalid.to_numpy()]
+                        bad_rows.to_csv(invalid_rows_file, mode="a", header=invalid_rows == 0, index_label="row")
+                        invalid_rows += len(bad_rows)
+                        examples.extend(bad_rows.index[:self.config.max_examples - len(examples)].tolist())
+
+            for col_stats in stats.values():
+                if col_stats["min"] > col_stats["max"]:
+                    col_stats["min"] = col_stats["max"] = None
+
+            profiler.set_rows(rows_in=rows, rows_out=rows - invalid_rows)
+            validation_status = not column_report["missing"] and not column_report["unexpected"] and invalid_rows == 0
+            report = {
+                "Validation status": bool(validation_status),
+                "rows": rows,
+                "columns": column_report,
+                "invalid_rows": invalid_rows,
+                "invalid_rows_file": str(invalid_rows_file) if invalid_rows else None,
+                "invalid_row_examples": [int(row) for row in examples],
+                "checks": stats
+            }
+            self.write_status(report)
+
+            nulls = sum(col_stats["nulls"] for col_stats in stats.values())
+            out_of_range = sum(col_stats["out_of_range"] for col_stats in stats.values())
+            logger.info(f"Validation status: {validation_status} ({rows} rows, {invalid_rows} invalid, "
+                        f"{nulls} nulls, {out_of_range} out of range, columns {column_report})")
             return validation_status
 
         except Exception as e:
-            raise e
\ No newline at end of file
+            raise e
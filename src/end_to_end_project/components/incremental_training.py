@@ -0,0 +1,157 @@
+import numpy as np
+from pathlib import Path
+from sklearn.linear_model import ElasticNet
+
+
+def in_sorted(values: np.ndarray, sorted_values: np.ndarray) -> np.ndarray:
+    """Membership of every value in a sorted array, by binary search."""
+    if len(sorted_values) == 0:
+        return np.zeros(len(values), dtype=bool)
+    # searching in sorted order walks the big array front to back, several times faster than random probes
+    order = np.argsort(values, kind="stable")
+    idx = np.empty(len(values), dtype=np.int64)
+    idx[order] = np.searchsorted(sorted_values, values[order])
+    idx = np.minimum(idx, len(sorted_values) - 1)
+    return sorted_values[idx] == values
+
+
+def soft_threshold(x: float, threshold: float) -> float:
+    return np.sign(x) * max(abs(x) - threshold, 0.0)
+
+
+class OnlineElasticNet:
+    """
+    ElasticNet updated from chunks of new rows only.
+
+    The squared loss only depends on the data through a few sufficient
+    statistics: the row count, the column sums, X^T X, X^T y and the sums of
+    y (all taken around the mean of the first chunk, which keeps the
+    centering below from cancelling digits on columns like density).
+    `partial_fit` adds a chunk to them, `solve` re-runs coordinate descent
+    on the centered Gram matrix (d x d, whatever the number of rows) starting
+    from the current coefficients. The result is the exact sklearn ElasticNet
+    objective over every row ever added, at the cost of reading new rows once.
+
+    Rows can't be taken back out of the statistics: rows that left the
+    training set since they were added keep counting, which is what the drift
+    check of `ModelTraining` measures.
+    """
+
+    def __init__(self, alpha: float, l1_ratio: float, n_features: int, tol: float = 1e-10, max_iter: int = 10000):
+        self.alpha = alpha
+        self.l1_ratio = l1_ratio
+        self.tol = tol
+        self.max_iter = max_iter
+        self.n = 0
+        self.x_shift = None
+        self.y_shift = 0.0
+        self.x_sum = np.zeros(n_features)
+        self.y_sum = 0.0
+        self.gram = np.zeros((n_features, n_features))
+        self.xty = np.zeros(n_features)
+        self.coef = np.zeros(n_features)
+        self.intercept = 0.0
+        self.n_iter = 0
+
+    def partial_fit(self, X: np.ndarray, y: np.ndarray) -> "OnlineElasticNet":
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if self.x_shift is None:
+            self.x_shift, self.y_shift = X.mean(axis=0), float(y.mean())
+        X = X - self.x_shift
+        y = y - self.y_shift
+        self.n += len(X)
+        self.x_sum += X.sum(axis=0)
+        self.y_sum += float(y.sum())
+        self.gram += X.T @ X
+        self.xty += X.T @ y
+        return self
+
+    def solve(self) -> "OnlineElasticNet":
+        if self.n == 0:
+            raise ValueError("OnlineElasticNet has not seen any rows")
+        x_mean = self.x_sum / self.n
+        y_mean = self.y_sum / self.n
+        # centered statistics, scaled to sklearn's 1 / (2 n) loss
+        Q = self.gram / self.n - np.outer(x_mean, x_mean)
+        q = self.xty / self.n - x_mean * y_mean
+        l1 = self.alpha * self.l1_ratio
+        l2 = self.alpha * (1.0 - self.l1_ratio)
+
+        w = self.coef.copy()
+        for n_iter in range(1, self.max_iter + 1):
+            max_change = 0.0
+            for j in range(len(w)):
+                if Q[j, j] == 0.0:
+                    continue
+                # partial residual correlation without feature j
+                rho = q[j] - Q[j] @ w + Q[j, j] * w[j]
+                new = soft_threshold(rho, l1) / (Q[j, j] + l2)
+                max_change = max(max_change, abs(new - w[j]))
+                w[j] = new
+            if max_change <= self.tol * max(1.0, np.max(np.abs(w))):
+                break
+
+        self.coef = w
+        self.intercept = float(y_mean + self.y_shift - (x_mean + self.x_shift) @ w)
+        self.n_iter = n_iter
+        return self
+
+    def predict(self, X) -> np.ndarray:
+        return np.asarray(X, dtype=np.float64) @ self.coef + self.intercept
+
+    def to_sklearn(self, feature_names: list) -> ElasticNet:
+        """A fitted sklearn ElasticNet with these coefficients, for model.joblib and the sklearn backend."""
+        model = ElasticNet(alpha=self.alpha, l1_ratio=self.l1_ratio, random_state=42)
+        model.coef_ = self.coef.copy()
+        model.intercept_ = self.intercept
+        model.n_iter_ = self.n_iter
+        model.dual_gap_ = 0.0
+        model.n_features_in_ = len(feature_names)
+        model.feature_names_in_ = np.array(feature_names, dtype=object)
+        return model
+
+    def save(self, path: Path, row_hashes: np.ndarray, feature_names: list, **extra):
+        """Checkpoint of the optimizer state plus the sorted hashes of the rows already added."""
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                alpha=np.float64(self.alpha),
+                l1_ratio=np.float64(self.l1_ratio),
+                n=np.int64(self.n),
+                x_shift=self.x_shift,
+                y_shift=np.float64(self.y_shift),
+                x_sum=self.x_sum,
+                y_sum=np.float64(self.y_sum),
+                gram=self.gram,
+                xty=self.xty,
+                coef=self.coef,
+                intercept=np.float64(self.intercept),
+                n_iter=np.int64(self.n_iter),
+                row_hashes=np.sort(np.asarray(row_hashes, dtype=np.uint64)),
+                feature_names=np.array(feature_names, dtype=str),
+                **{key: np.asarray(value) for key, value in extra.items()}
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> tuple:
+        """
+        Returns:
+            tuple: (model, sorted row hashes, feature names, dict of the extra values)
+        """
+        with np.load(path, allow_pickle=False) as data:
+            model = cls(alpha=float(data["alpha"]), l1_ratio=float(data["l1_ratio"]), n_features=len(data["coef"]))
+            model.n = int(data["n"])
+            model.x_shift = data["x_shift"]
+            model.y_shift = float(data["y_shift"])
+            model.x_sum = data["x_sum"]
+            model.y_sum = float(data["y_sum"])
+            model.gram = data["gram"]
+            model.xty = data["xty"]
+            model.coef = data["coef"]
+            model.intercept = float(data["intercept"])
+            model.n_iter = int(data["n_iter"])
+            known = {"alpha", "l1_ratio", "n", "x_shift", "y_shift", "x_sum", "y_sum", "gram", "xty", "coef", "intercept", "n_iter",
+                     "row_hashes", "feature_names"}
+            extra = {key: data[key][()] for key in data.files if key not in known}
+            return model, data["row_hashes"], data["feature_names"].tolist(), extra
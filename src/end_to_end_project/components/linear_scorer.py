@@ -0,0 +1,66 @@
+import numpy as np
+from pathlib import Path
+from typing import Optional
+
+# kept free of scikit-learn (and pandas) on purpose: serving with this scorer
+# only needs numpy, which keeps container cold start and per-call overhead low
+
+
+class LinearScorer:
+    """
+    Pure NumPy scorer for a fitted linear model (ElasticNet).
+
+    The artifact is an uncompressed `.npz` holding `coef`, `intercept`,
+    `feature_names` and `schema_hash`, so loading is a few small reads and
+    scoring is a single `X @ coef + intercept`.
+    """
+
+    def __init__(self, coef: np.ndarray, intercept: float, feature_names: list, schema_hash: str):
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.feature_names = list(feature_names)
+        self.schema_hash = schema_hash
+        if self.coef.shape != (len(self.feature_names),):
+            raise ValueError(f"coef shape {self.coef.shape} does not match {len(self.feature_names)} features")
+
+    @classmethod
+    def from_model(cls, model, feature_names: list, schema_hash: str) -> "LinearScorer":
+        return cls(
+            coef=np.ravel(model.coef_),
+            intercept=np.ravel(model.intercept_)[0],
+            feature_names=feature_names,
+            schema_hash=schema_hash
+        )
+
+    def save(self, path: Path):
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                coef=self.coef,
+                intercept=np.float64(self.intercept),
+                feature_names=np.array(self.feature_names, dtype=str),
+                schema_hash=np.array(self.schema_hash, dtype=str)
+            )
+
+    @classmethod
+    def load(cls, path: Path, expected_schema_hash: Optional[str] = None) -> "LinearScorer":
+        with np.load(path, allow_pickle=False) as data:
+            scorer = cls(
+                coef=data["coef"],
+                intercept=data["intercept"][()],
+                feature_names=data["feature_names"].tolist(),
+                schema_hash=str(data["schema_hash"][()])
+            )
+        if expected_schema_hash is not None and scorer.schema_hash != expected_schema_hash:
+            raise ValueError(f"Model artifact {path} was trained on a different schema "
+                             f"({scorer.schema_hash[:12]} != {expected_schema_hash[:12]})")
+        return scorer
+
+    def predict(self, X) -> np.ndarray:
+        if hasattr(X, "columns"):
+            # a DataFrame: pick the training column order by name
+            X = X[self.feature_names].to_numpy(dtype=np.float64)
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.coef.shape[0]:
+            raise ValueError(f"Expected input of shape (n, {self.coef.shape[0]}), got {X.shape}")
+        return X @ self.coef + self.intercept
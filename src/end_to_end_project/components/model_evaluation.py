@@ -1,20 +1,17 @@
-import os
-import pandas as pd
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-from urllib.parse import urlparse
-from dagshub import init
-import mlflow
-import mlflow.sklearn
 import numpy as np
 import joblib
 from end_to_end_project.utils.common import save_json
+from end_to_end_project.utils.data_io import get_xy
+from end_to_end_project.utils.artifact_store import get_artifact_store
+from end_to_end_project.utils.profiling import profiler
 from end_to_end_project.entity.config_entity import ModelEvaluationConfig
+from end_to_end_project.components.tracking import get_tracker
 from pathlib import Path
 
 class ModelEvaluation:
     def __init__(self, config: ModelEvaluationConfig):
         self.config = config
-        init(repo_owner="rajwaAth", repo_name='MLOps-Project', mlflow=True)
 
     def eval_metrics(self, actual, pred):
         rmse = np.sqrt(mean_squared_error(actual, pred))
@@ -22,13 +19,12 @@ class ModelEvaluation:
         r2 = r2_score(actual, pred)
         return rmse, mae, r2
     
-    def log_into_mlflow(self):
-        test_data = pd.read_csv(self.config.data_test_path)
-        model = joblib.load(self.config.model_path)
-
-        X_test = test_data.drop(columns=[self.config.target_col])
-        y_test = test_data[self.config.target_col]
+    def log_evaluation(self):
+        X_test, y_test = get_xy(self.config.data_test_path, self.config.target_col, self.config.all_schema)
+        store = get_artifact_store()
+        model = store.get(self.config.model_path, load=joblib.load)
 
+        profiler.set_rows(rows_in=len(X_test))
         pred = model.predict(X_test)
         rmse, mae, r2 = self.eval_metrics(y_test, pred)
 
@@ -39,11 +35,11 @@ class ModelEvaluation:
         }
         save_json(path=Path(self.config.metric_file), data=scores)
 
-        with mlflow.start_run():
-            mlflow.log_params(self.config.all_params)
-            for key, value in scores.items():
-                mlflow.log_metric(key, value)
-            mlflow.sklearn.log_model(model, "model", registered_model_name="ElasticNetModel")
-
-
-
+        # calls are queued and sent by a background thread, leaving the block waits for them
+        # the tracker copies the model file
+        store.wait([self.config.model_path])
+        with get_tracker(self.config) as tracker:
+            tracker.start_run(tags={"stage": "model_evaluation"})
+            tracker.log_params(self.config.all_params)
+            tracker.log_metrics(scores)
+            tracker.log_model(model, self.config.model_path, registered_model_name=self.config.registered_model_name)
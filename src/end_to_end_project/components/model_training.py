@@ -1,22 +1,35 @@
 import pandas as pd
 import os
+import time
+import numpy as np
+from pathlib import Path
 from end_to_end_project import logger
 import joblib
 from sklearn.linear_model import ElasticNet
 from end_to_end_project.entity.config_entity import ModelTrainingConfig
+from end_to_end_project.components.linear_scorer import LinearScorer
+from end_to_end_project.components.incremental_training import OnlineElasticNet, in_sorted
+from end_to_end_project.components.streaming_transformation import row_hashes
+from end_to_end_project.utils.common import get_schema_hash, save_json
+from end_to_end_project.utils.data_io import get_xy
+from end_to_end_project.utils.artifact_store import get_artifact_store
+from end_to_end_project.utils.profiling import profiler
 
 class ModelTraining:
     def __init__(self, config: ModelTrainingConfig):
         self.config = config
+        # incremental update report that triggered a full rebuild, kept in the full fit's report
+        self.rebuild_report = None
 
     def train_model(self):
-        train_data = pd.read_csv(self.config.data_train_path)
-        test_data = pd.read_csv(self.config.data_test_path)
+        if self.config.training_mode == "incremental" and self.train_incremental():
+            return
+        self.train_full()
 
-        X_train = train_data.drop([self.config.target_column], axis=1)
-        y_train = train_data[self.config.target_column]
-        X_test = test_data.drop([self.config.target_column], axis=1)
-        y_test = test_data[self.config.target_column]
+    def train_full(self):
+        X_train, y_train = get_xy(self.config.data_train_path, self.config.target_column, self.config.all_schema)
+        X_test, y_test = get_xy(self.config.data_test_path, self.config.target_column, self.config.all_schema)
+        profiler.set_rows(rows_in=len(X_train))
 
         model = ElasticNet(
             alpha=self.config.alpha,
@@ -25,4 +38,112 @@ class ModelTraining:
         )
         model.fit(X_train, y_train)
 
-        joblib.dump(model, os.path.join(self.config.root_dir, self.config.model_name))
\ No newline at end of file
+        get_artifact_store().put(os.path.join(self.config.root_dir, self.config.model_name), model, save=joblib.dump)
+        self.export_linear_model(model, list(X_train.columns), X_test)
+
+        # statistics of the full train set, the starting point of the next incremental update
+        online = OnlineElasticNet(self.config.alpha, self.config.l1_ratio, n_features=X_train.shape[1])
+        hashes = []
+        for X, y, chunk_hashes in self.iter_chunks(X_train, y_train):
+            online.partial_fit(X, y)
+            hashes.append(chunk_hashes)
+        online.coef, online.intercept, online.n_iter = model.coef_.copy(), float(model.intercept_), int(model.n_iter_)
+        online.save(self.checkpoint_path, np.concatenate(hashes), list(X_train.columns), updates_since_full=0)
+        self.write_drift_report({"mode": "full", "rows": online.n, "rebuilt_after": self.rebuild_report})
+
+    def train_incremental(self) -> bool:
+        """Update the checkpointed model with the rows of train it hasn't seen, False when a full refit is needed."""
+        if not os.path.exists(self.checkpoint_path):
+            logger.info("No training checkpoint yet, running a full fit")
+            return False
+        X_train, y_train = get_xy(self.config.data_train_path, self.config.target_column, self.config.all_schema)
+        X_test, y_test = get_xy(self.config.data_test_path, self.config.target_column, self.config.all_schema)
+        profiler.set_rows(rows_in=len(X_train))
+        online, known, feature_names, extra = OnlineElasticNet.load(self.checkpoint_path)
+        if (online.alpha, online.l1_ratio) != (self.config.alpha, self.config.l1_ratio) or feature_names != list(X_train.columns):
+            logger.info("Model parameters or features changed since the checkpoint, running a full fit")
+            return False
+
+        start = time.perf_counter()
+        new_rows, hashes, new_hashes = 0, [], []
+        for X, y, chunk_hashes in self.iter_chunks(X_train, y_train):
+            new = ~in_sorted(chunk_hashes, known)
+            if new.any():
+                online.partial_fit(X[new], y[new])
+                new_rows += int(new.sum())
+                new_hashes.append(chunk_hashes[new])
+            hashes.append(chunk_hashes)
+        # rows still in the statistics that are no longer part of train
+        stale_rows = int((~in_sorted(known, np.sort(np.concatenate(hashes)))).sum())
+        online.solve()
+
+        report = {
+            "mode": "incremental",
+            "rows": online.n,
+            "new_rows": new_rows,
+            "stale_rows": stale_rows,
+            "stale_fraction": stale_rows / online.n,
+            "updates_since_full": int(extra.get("updates_since_full", 0)) + 1,
+            "n_iter": online.n_iter,
+            "seconds": time.perf_counter() - start
+        }
+        if report["updates_since_full"] % self.config.drift_check_every == 0:
+            report.update(self.measure_drift(online, X_train, y_train, X_test, y_test))
+
+        rebuild = report["stale_fraction"] > self.config.max_stale_fraction or report.get("drift", 0.0) > self.config.max_drift
+        if rebuild:
+            logger.warning(f"Incremental model drifted too far from a full refit ({report}), rebuilding")
+            self.rebuild_report = report
+            return False
+
+        model = online.to_sklearn(feature_names)
+        get_artifact_store().put(os.path.join(self.config.root_dir, self.config.model_name), model, save=joblib.dump)
+        self.export_linear_model(model, feature_names, X_test)
+        online.save(self.checkpoint_path, np.concatenate([known, *new_hashes]), feature_names,
+                    updates_since_full=report["updates_since_full"])
+        self.write_drift_report(report)
+        logger.info(f"Incremental training: {new_rows} new rows added to {online.n - new_rows}, "
+                    f"{stale_rows} stale, solved in {online.n_iter} iterations")
+        return True
+
+    def measure_drift(self, online: OnlineElasticNet, X_train, y_train, X_test, y_test) -> dict:
+        reference = ElasticNet(alpha=self.config.alpha, l1_ratio=self.config.l1_ratio, random_state=42)
+        reference.fit(X_train, y_train)
+        reference_pred = reference.predict(X_test)
+        incremental_pred = online.predict(X_test.to_numpy(dtype=np.float64))
+        y_test = y_test.to_numpy(dtype=np.float64)
+        return {
+            # relative distance of the coefficients to the ones of a full refit
+            "drift": float(np.linalg.norm(online.coef - reference.coef_) / max(np.linalg.norm(reference.coef_), 1e-12)),
+            "max_prediction_diff": float(np.max(np.abs(incremental_pred - reference_pred))),
+            "test_rmse_incremental": float(np.sqrt(np.mean((incremental_pred - y_test) ** 2))),
+            "test_rmse_full_refit": float(np.sqrt(np.mean((reference_pred - y_test) ** 2)))
+        }
+
+    def iter_chunks(self, X: pd.DataFrame, y: pd.Series, chunk_size: int = 100000):
+        """(X, y, row hashes) of consecutive row blocks, so memory-mapped datasets are read a block at a time."""
+        for start in range(0, len(X), chunk_size):
+            X_chunk, y_chunk = X.iloc[start:start + chunk_size], y.iloc[start:start + chunk_size]
+            hashes = row_hashes(X_chunk.assign(**{y.name: y_chunk.to_numpy()}))
+            yield X_chunk.to_numpy(dtype=np.float64), y_chunk.to_numpy(dtype=np.float64), hashes
+
+    @property
+    def checkpoint_path(self) -> str:
+        return os.path.join(self.config.root_dir, self.config.checkpoint_name)
+
+    def write_drift_report(self, report: dict):
+        path = os.path.join(self.config.root_dir, self.config.drift_report_name)
+        save_json(Path(path), {**report, "written_at": time.strftime("%Y-%m-%dT%H:%M:%S")})
+
+    def export_linear_model(self, model, feature_names: list, X_check: pd.DataFrame):
+        # compact numeric copy of the model for the sklearn-free serving backend
+        scorer = LinearScorer.from_model(model, feature_names, get_schema_hash(self.config.all_schema))
+
+        expected = model.predict(X_check)
+        actual = scorer.predict(X_check.to_numpy(dtype=np.float64))
+        if not np.allclose(actual, expected, rtol=1e-12, atol=1e-9):
+            raise ValueError(f"Linear scorer does not match the sklearn model, max abs diff: {np.max(np.abs(actual - expected))}")
+
+        path = os.path.join(self.config.root_dir, self.config.linear_model_name)
+        scorer.save(path)
+        logger.info(f"Linear model artifact saved at: {path} ({os.path.getsize(path)} bytes)")
@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import warnings
+import yaml
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.linear_model import ElasticNet
+from sklearn.model_selection import KFold
+from sklearn.exceptions import ConvergenceWarning
+from end_to_end_project import logger
+from end_to_end_project.entity.config_entity import ModelTuningConfig
+from end_to_end_project.utils.data_io import get_xy
+
+# training data for the pool workers, sent once per process by _init_worker
+_worker_data = None
+
+
+def _init_worker(X: np.ndarray, y: np.ndarray, folds: list):
+    global _worker_data
+    _worker_data = (X, y, folds)
+
+
+def _fit_path(task: dict) -> dict:
+    """Fit one l1_ratio along its whole alpha path on one fold, warm-starting from the previous alpha."""
+    X, y, folds = _worker_data
+    train_idx, valid_idx = folds[task["fold"]]
+    X_train, y_train = X[train_idx], y[train_idx]
+    X_valid, y_valid = X[valid_idx], y[valid_idx]
+
+    model = ElasticNet(l1_ratio=task["l1_ratio"], warm_start=True, random_state=42)
+    fits = []
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=ConvergenceWarning)
+        for alpha in task["alphas"]:
+            fit_start = time.perf_counter()
+            model.set_params(alpha=alpha)
+            model.fit(X_train, y_train)
+            fit_seconds = time.perf_counter() - fit_start
+            mse = float(np.mean((model.predict(X_valid) - y_valid) ** 2))
+            fits.append({"alpha": float(alpha), "mse": mse, "fit_seconds": fit_seconds, "n_iter": int(model.n_iter_)})
+    return {**task, "fits": fits, "seconds": time.perf_counter() - start}
+
+
+class ModelTuning:
+    """
+    K-fold cross-validated ElasticNet sweep over a grid of l1_ratios.
+
+    Every (l1_ratio, fold) pair is one task run on a process pool. A task walks
+    the alpha path from the largest alpha (all-zero coefficients) down, reusing
+    the previous solution as the starting point of the next fit, which is much
+    cheaper than fitting each grid point cold.
+    """
+
+    def __init__(self, config: ModelTuningConfig):
+        self.config = config
+
+    def alpha_path(self, X: np.ndarray, y: np.ndarray, l1_ratio: float) -> np.ndarray:
+        # smallest alpha for which all coefficients are zero, as in sklearn's _alpha_grid
+        Xc = X - X.mean(axis=0)
+        alpha_max = np.max(np.abs(Xc.T @ (y - y.mean()))) / (len(y) * max(l1_ratio, 1e-3))
+        return np.geomspace(alpha_max, alpha_max * self.config.alpha_min_ratio, self.config.n_alphas)
+
+    def run_sweep(self) -> dict:
+        X, y = get_xy(self.config.data_train_path, self.config.target_column, self.config.all_schema)
+        X, y = X.to_numpy(dtype=np.float64), y.to_numpy(dtype=np.float64)
+        folds = list(KFold(n_splits=self.config.cv_folds, shuffle=True, random_state=42).split(X))
+
+        tasks = [
+            {"l1_ratio": float(l1_ratio), "fold": fold, "alphas": self.alpha_path(X, y, l1_ratio).tolist()}
+            for l1_ratio in self.config.l1_ratios
+            for fold in range(len(folds))
+        ]
+        n_jobs = self.config.n_jobs if self.config.n_jobs > 0 else os.cpu_count()
+        logger.info(f"Sweeping {len(self.config.l1_ratios)} l1_ratios x {self.config.n_alphas} alphas "
+                    f"x {len(folds)} folds on {n_jobs} process(es)")
+
+        start = time.perf_counter()
+        if n_jobs > 1:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(X, y, folds)) as executor:
+                results = list(executor.map(_fit_path, tasks))
+        else:
+            _init_worker(X, y, folds)
+            results = [_fit_path(task) for task in tasks]
+        wall_seconds = time.perf_counter() - start
+
+        grid = []
+        for l1_ratio in self.config.l1_ratios:
+            paths = [r for r in results if r["l1_ratio"] == float(l1_ratio)]
+            for i, alpha in enumerate(paths[0]["alphas"]):
+                fold_fits = [path["fits"][i] for path in paths]
+                mse = np.array([fit["mse"] for fit in fold_fits])
+                grid.append({
+                    "l1_ratio": float(l1_ratio),
+                    "alpha": float(alpha),
+                    "mean_mse": float(mse.mean()),
+                    "std_mse": float(mse.std()),
+                    "fit_seconds": [fit["fit_seconds"] for fit in fold_fits],
+                    "n_iter": [fit["n_iter"] for fit in fold_fits]
+                })
+
+        best = min(grid, key=lambda point: point["mean_mse"])
+        fit_seconds = [t for point in grid for t in point["fit_seconds"]]
+        report = {
+            "best": {"alpha": best["alpha"], "l1_ratio": best["l1_ratio"], "mean_mse": best["mean_mse"]},
+            "cv_folds": len(folds),
+            "n_fits": len(fit_seconds),
+            "n_jobs": n_jobs,
+            "wall_seconds": wall_seconds,
+            "total_fit_seconds": float(np.sum(fit_seconds)),
+            "mean_fit_seconds": float(np.mean(fit_seconds)),
+            "task_seconds": [{"l1_ratio": r["l1_ratio"], "fold": r["fold"], "seconds": r["seconds"]} for r in results],
+            "grid": grid
+        }
+        logger.info(f"Sweep finished in {wall_seconds:.2f}s ({len(fit_seconds)} fits): best {report['best']}")
+        return report
+
+    def save_results(self, report: dict):
+        with open(self.config.results_file, "w") as f:
+            json.dump(report, f, indent=4)
+        logger.info(f"Sweep results saved at: {self.config.results_file}")
+
+    def update_params(self, report: dict):
+        # write the winner back as the ElasticNet params used by training and evaluation,
+        # editing only those two lines so the rest of params.yaml (comments included) stays as is
+        values = {"alpha": report["best"]["alpha"], "l1_ratio": report["best"]["l1_ratio"]}
+        with open(self.config.params_file) as f:
+            lines = f.read().splitlines()
+
+        in_block = False
+        for i, line in enumerate(lines):
+            if line and not line[0].isspace():
+                in_block = line.split(":")[0].strip() == "ElasticNet"
+                continue
+            key = line.split(":")[0].strip()
+            if in_block and key in values:
+                indent = line[:len(line) - len(line.lstrip())]
+                lines[i] = f"{indent}{key}: {values[key]!r}"
+
+        with open(self.config.params_file, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        with open(self.config.params_file) as f:
+            written = yaml.safe_load(f)["ElasticNet"]
+        if written["alpha"] != values["alpha"] or written["l1_ratio"] != values["l1_ratio"]:
+            raise ValueError(f"Could not write the sweep result to {self.config.params_file}")
+        logger.info(f"Updated {self.config.params_file} with alpha={values['alpha']}, l1_ratio={values['l1_ratio']}")
@@ -0,0 +1,90 @@
+import numpy as np
+from sklearn.neighbors import NearestNeighbors
+from end_to_end_project import logger
+
+
+class ChunkedSMOTE:
+    """
+    SMOTE oversampling that scales with the training set.
+
+    Works one minority class at a time: the k nearest neighbours of the class
+    samples that get picked are searched in chunks (`n_jobs` workers per
+    query), keeping only a (n_class, k) index table, then synthetic rows are interpolated chunk by
+    chunk straight into an output array allocated once for the final size. No
+    DataFrame is concatenated and no full distance matrix is ever built.
+
+    `max_ratio` caps how far a class is grown: to the majority class size but
+    at most `max_ratio` times its original count, so a handful of samples is
+    not blown up into hundreds of thousands of near-copies.
+    """
+
+    def __init__(self, k_neighbors: int = 5, max_ratio: float = None, chunk_size: int = 100000,
+                 n_jobs: int = -1, random_state: int = 42):
+        self.k_neighbors = k_neighbors
+        self.max_ratio = max_ratio
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def sampling_plan(self, y: np.ndarray) -> dict:
+        """Number of synthetic rows per class."""
+        classes, counts = np.unique(y, return_counts=True)
+        target = counts.max()
+        plan = {}
+        for cls, count in zip(classes, counts):
+            goal = target if self.max_ratio is None else min(target, int(count * self.max_ratio))
+            if goal > count:
+                plan[cls] = int(goal - count)
+        return plan
+
+    def neighbors(self, X_class: np.ndarray, k: int, rows: np.ndarray) -> np.ndarray:
+        """k nearest neighbours of the given class rows, the other rows of the table are left unset."""
+        nn = NearestNeighbors(n_neighbors=k + 1, n_jobs=self.n_jobs).fit(X_class)
+        table = np.empty((len(X_class), k), dtype=np.int64)
+        for start in range(0, len(rows), self.chunk_size):
+            chunk = rows[start:start + self.chunk_size]
+            # the first neighbour of a sample is itself
+            table[chunk] = nn.kneighbors(X_class[chunk], return_distance=False)[:, 1:]
+        return table
+
+    def fit_resample(self, X: np.ndarray, y: np.ndarray):
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y)
+        rng = np.random.default_rng(self.random_state)
+        plan = self.sampling_plan(y)
+
+        total = len(X) + sum(plan.values())
+        X_out = np.empty((total, X.shape[1]), dtype=np.float64)
+        y_out = np.empty(total, dtype=y.dtype)
+        X_out[:len(X)], y_out[:len(y)] = X, y
+        pos = len(X)
+
+        for cls, n_samples in plan.items():
+            X_class = X[y == cls]
+            k = min(self.k_neighbors, len(X_class) - 1)
+            if k < 1:
+                logger.warning(f"Class {cls} has a single sample, nothing to interpolate, skipping it")
+                continue
+            # same sampling as imblearn: a random (sample, neighbour) pair and a uniform step;
+            # drawn up front so neighbours are only searched for the samples actually used,
+            # which matters for large classes that only need a few synthetic rows
+            pairs = rng.integers(0, len(X_class) * k, size=n_samples)
+            table = self.neighbors(X_class, k, np.unique(pairs // k))
+
+            for start in range(0, n_samples, self.chunk_size):
+                m = min(self.chunk_size, n_samples - start)
+                rows, cols = np.divmod(pairs[start:start + m], k)
+                steps = rng.uniform(size=(m, 1))
+                out = X_out[pos:pos + m]
+                base = X_class[rows]
+                np.subtract(X_class[table[rows, cols]], base, out=out)
+                out *= steps
+                out += base
+                y_out[pos:pos + m] = cls
+                pos += m
+
+        if pos < total:
+            X_out, y_out = X_out[:pos], y_out[:pos]
+        synthetic = {str(cls): n for cls, n in plan.items()}
+        logger.info(f"Oversampled {len(X)} rows to {pos}, synthetic rows per class: {synthetic}")
+        return X_out, y_out
@@ -0,0 +1,80 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scipy import stats
+from end_to_end_project import logger
+
+
+def column_skewness(X: np.ndarray) -> np.ndarray:
+    """
+    Sample skewness of every column in one vectorized pass
+
+    Same estimator as pandas' `Series.skew` (adjusted Fisher-Pearson, NaNs
+    skipped): 0 for constant columns, NaN with fewer than 3 values.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    mask = ~np.isnan(X)
+    count = mask.sum(axis=0).astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(mask, X, 0).sum(axis=0) / count
+        adjusted = np.where(mask, X - mean, 0)
+        adjusted2 = adjusted ** 2
+        m2 = adjusted2.sum(axis=0)
+        m3 = (adjusted2 * adjusted).sum(axis=0)
+        m2 = np.where(np.abs(m2) < 1e-14, 0, m2)
+        skew = (count * (count - 1) ** 0.5 / (count - 2)) * (m3 / m2 ** 1.5)
+    skew = np.where(m2 == 0, 0, skew)
+    return np.where(count < 3, np.nan, skew)
+
+
+def _fit_lambda(task: tuple) -> tuple:
+    """
+    Yeo-Johnson lambda of one column, the MLE PowerTransformer computes
+
+    With a sample size the lambda is first fitted on a random subsample, which
+    is doubled until two consecutive lambdas differ by less than the tolerance,
+    relative to the lambda when it is larger than 1 (or the whole column is used).
+    """
+    x, sample_size, tolerance, seed = task
+    x = x[~np.isnan(x)]
+    if not sample_size or sample_size >= len(x):
+        return float(stats.yeojohnson_normmax(x)), len(x)
+
+    order = np.random.default_rng(seed).permutation(len(x))
+    size = sample_size
+    previous = float(stats.yeojohnson_normmax(x[order[:size]]))
+    while size < len(x):
+        size = min(2 * size, len(x))
+        lmbda = float(stats.yeojohnson_normmax(x[order[:size]]))
+        if abs(lmbda - previous) < tolerance * max(1.0, abs(previous)):
+            return lmbda, size
+        previous = lmbda
+    return previous, size
+
+
+def fit_yeo_johnson_lambdas(X: np.ndarray, n_jobs: int = -1, sample_size: int = None,
+                            tolerance: float = 0.01, seed: int = 42) -> np.ndarray:
+    """
+    Fit the Yeo-Johnson lambda of every column, columns in parallel
+
+    Args:
+        X (np.ndarray): 2D array, one lambda per column
+        n_jobs (int): worker processes, -1 for one per CPU; columns are fitted in-process when 1
+        sample_size (int): start from a random subsample of this many rows (None: all rows)
+        tolerance (float): stop doubling the subsample once lambda moves less than this (relative above 1)
+
+    Returns:
+        np.ndarray: lambdas, same values as PowerTransformer.lambdas_ without a sample size
+    """
+    X = np.asarray(X, dtype=np.float64)
+    tasks = [(np.ascontiguousarray(X[:, j]), sample_size, tolerance, seed + j) for j in range(X.shape[1])]
+    n_jobs = min(n_jobs if n_jobs > 0 else os.cpu_count(), len(tasks))
+    if n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(_fit_lambda, tasks))
+    else:
+        results = [_fit_lambda(task) for task in tasks]
+
+    if sample_size:
+        logger.info(f"Yeo-Johnson lambdas fitted on {[size for _, size in results]} of {len(X)} rows")
+    return np.array([lmbda for lmbda, _ in results])
@@ -0,0 +1,124 @@
+import numpy as np
+from pathlib import Path
+
+# like the linear scorer this only needs numpy, so serving can apply the
+# fitted transformation without importing scikit-learn or pandas
+
+
+def yeo_johnson(X: np.ndarray, lambdas: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Yeo-Johnson transform of every column of X with its own lambda
+
+    Args:
+        X (np.ndarray): 2D array, one column per lambda
+        lambdas (np.ndarray): fitted lambdas (PowerTransformer.lambdas_)
+
+    Returns:
+        np.ndarray: transformed array, same formula as sklearn's PowerTransformer
+    """
+    X = np.asarray(X, dtype=np.float64)
+    lambdas = np.broadcast_to(np.asarray(lambdas, dtype=np.float64), X.shape)
+    out = np.empty_like(X)
+    eps = np.spacing(1.0)
+
+    pos = X >= 0
+    lam, x = lambdas[pos], X[pos]
+    zero = np.abs(lam) < eps
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[pos] = np.where(zero, np.log1p(x), (np.power(x + 1, lam) - 1) / np.where(zero, 1, lam))
+
+    neg = ~pos
+    lam, x = lambdas[neg], X[neg]
+    two = np.abs(lam - 2) < eps
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[neg] = np.where(two, -np.log1p(-x), -(np.power(-x + 1, 2 - lam) - 1) / np.where(two, 1, 2 - lam))
+    return out
+
+
+class Preprocessor:
+    """
+    Fitted state of the data transformation stage, applied at serving time.
+
+    Holds the IQR capping bounds (`handle_outliers`), the skewed columns with
+    their Yeo-Johnson lambdas and the standardization stats of the transformed
+    values (`handle_skewness_normalize`). `transform` applies all of it to a
+    whole batch in a few array operations, in the same order as training.
+    """
+
+    def __init__(self, feature_names: list, lower=None, upper=None, skewed_idx=None, lambdas=None, mean=None, scale=None):
+        n = len(feature_names)
+        self.feature_names = list(feature_names)
+        self.lower = np.full(n, -np.inf) if lower is None else np.asarray(lower, dtype=np.float64)
+        self.upper = np.full(n, np.inf) if upper is None else np.asarray(upper, dtype=np.float64)
+        self.skewed_idx = np.zeros(0, dtype=np.int64) if skewed_idx is None else np.asarray(skewed_idx, dtype=np.int64)
+        k = len(self.skewed_idx)
+        self.lambdas = np.ones(k) if lambdas is None else np.asarray(lambdas, dtype=np.float64)
+        self.mean = np.zeros(k) if mean is None else np.asarray(mean, dtype=np.float64)
+        self.scale = np.ones(k) if scale is None else np.asarray(scale, dtype=np.float64)
+
+    @property
+    def capping(self) -> bool:
+        return bool(np.isfinite(self.lower).any() or np.isfinite(self.upper).any())
+
+    @property
+    def is_identity(self) -> bool:
+        return not self.capping and len(self.skewed_idx) == 0
+
+    def set_capping_bounds(self, bounds: dict):
+        for col, (lower, upper) in bounds.items():
+            i = self.feature_names.index(col)
+            self.lower[i], self.upper[i] = lower, upper
+
+    def set_power_transform(self, skewed_cols: list, lambdas, mean, scale):
+        self.skewed_idx = np.array([self.feature_names.index(col) for col in skewed_cols], dtype=np.int64)
+        self.lambdas = np.asarray(lambdas, dtype=np.float64)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+
+    def transform(self, X, copy: bool = True) -> np.ndarray:
+        X = np.array(X, dtype=np.float64, copy=copy)
+        if X.ndim != 2 or X.shape[1] != len(self.feature_names):
+            raise ValueError(f"Expected input of shape (n, {len(self.feature_names)}), got {X.shape}")
+        if self.capping:
+            np.clip(X, self.lower, self.upper, out=X)
+        if len(self.skewed_idx):
+            idx = self.skewed_idx
+            X[:, idx] = (yeo_johnson(X[:, idx], self.lambdas) - self.mean) / self.scale
+        return X
+
+    def save(self, path: Path):
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                feature_names=np.array(self.feature_names, dtype=str),
+                lower=self.lower,
+                upper=self.upper,
+                skewed_idx=self.skewed_idx,
+                lambdas=self.lambdas,
+                mean=self.mean,
+                scale=self.scale
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "Preprocessor":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                feature_names=data["feature_names"].tolist(),
+                lower=data["lower"],
+                upper=data["upper"],
+                skewed_idx=data["skewed_idx"],
+                lambdas=data["lambdas"],
+                mean=data["mean"],
+                scale=data["scale"]
+            )
+
+
+class PreprocessedModel:
+    """A model with the fitted preprocessing fused in front of it, exposes the same `predict`."""
+
+    def __init__(self, preprocessor: Preprocessor, model):
+        self.preprocessor = preprocessor
+        self.model = model
+
+    def predict(self, X) -> np.ndarray:
+        return self.model.predict(self.preprocessor.transform(X))
@@ -0,0 +1,179 @@
+import os
+import numpy as np
+import pandas as pd
+from end_to_end_project import logger
+from end_to_end_project.entity.config_entity import DataTransformationConfig
+from end_to_end_project.components.preprocessor import Preprocessor
+from end_to_end_project.components.outlier_capping import OutlierCapper
+from end_to_end_project.utils.data_io import DatasetWriter
+from end_to_end_project.utils.archive import open_source
+from end_to_end_project.utils.profiling import profiler, profiled
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """64-bit hash of every row's content (index excluded), stable across runs and processes."""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def hash_split(hashes: np.ndarray, test_size: float, seed: int = 42) -> np.ndarray:
+    """
+    Deterministic train/test assignment from row hashes
+
+    The hashes are re-mixed with the seed (splitmix64 finalizer) so the split
+    does not depend on the same bits used for deduplication, then mapped to
+    [0, 1) and compared with test_size. The same row always lands on the same
+    side, whatever the chunking or file order.
+
+    Returns:
+        np.ndarray: boolean mask, True for test rows
+    """
+    z = hashes.astype(np.uint64) ^ np.uint64(seed)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) / float(1 << 53) < test_size
+
+
+class RowHashSet:
+    """
+    Set of 64-bit row hashes kept as a few sorted uint64 runs (8 bytes per row).
+
+    New hashes become a run of their own, and runs are merged log-structured
+    style whenever the newest is at least as large as the one before it, so
+    there are O(log n) runs to binary search and inserts stay amortized cheap.
+    """
+
+    def __init__(self):
+        self.runs = []
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self.runs)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(run.nbytes for run in self.runs)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        seen = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            idx = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            seen |= run[idx] == hashes
+        return seen
+
+    def add_new(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Add a chunk of hashes
+
+        Returns:
+            np.ndarray: boolean mask of the rows seen for the first time, the
+            first occurrence of a duplicate inside the chunk counts as new
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        _, first = np.unique(hashes, return_index=True)
+        first.sort()
+        new = first[~self.contains(hashes[first])]
+
+        mask = np.zeros(len(hashes), dtype=bool)
+        mask[new] = True
+        if len(new):
+            self._push(np.sort(hashes[new]))
+        return mask
+
+    def _push(self, run: np.ndarray):
+        # runs are disjoint, so merging is a concatenate + sort
+        while self.runs and len(self.runs[-1]) <= len(run):
+            run = np.sort(np.concatenate([self.runs.pop(), run]))
+        self.runs.append(run)
+
+
+class OutOfCoreTransformation:
+    """
+    Streaming counterpart of `DataTransformation.run_data_transformation`.
+
+    The raw CSV is read `chunk_size` rows at a time. Rows with nulls are
+    dropped, duplicates are dropped against a `RowHashSet` of everything seen
+    so far (first occurrence wins, like `drop_duplicates`) and each remaining
+    row goes to train or test from its content hash. Both splits are appended
+    to their artifacts as they are produced, so peak memory is one chunk plus
+    8 bytes per unique row, instead of several copies of the dataset.
+
+    Outlier capping needs the train quartiles before the first row is written,
+    so it adds a first pass that only feeds the train rows to an
+    `OutlierCapper` quantile sketch; cleaning and splitting are deterministic,
+    so the second pass sees exactly the same rows.
+    """
+
+    def __init__(self, config: DataTransformationConfig, test_size: float = 0.25, seed: int = 42):
+        self.config = config
+        self.test_size = test_size
+        self.seed = seed
+        self.seen = RowHashSet()
+        self.counts = {}
+
+    def read_chunks(self):
+        with open_source(self.config.data_path) as source:
+            yield from pd.read_csv(source, chunksize=self.config.chunk_size)
+
+    def clean_split(self, do_clean: bool = True):
+        """Yield (train, test) chunk pairs, cleaned and split, from one pass over the raw data."""
+        self.seen = RowHashSet()
+        self.counts = {"rows": 0, "nulls": 0, "duplicates": 0}
+        for chunk in self.read_chunks():
+            self.counts["rows"] += len(chunk)
+            if do_clean:
+                before = len(chunk)
+                chunk = chunk.dropna()
+                self.counts["nulls"] += before - len(chunk)
+
+            # hash the schema dtypes, a chunk where pandas inferred other dtypes must hash the same
+            chunk = chunk.astype({col: dtype for col, dtype in self.config.all_schema.items() if col in chunk.columns})
+            hashes = row_hashes(chunk)
+            if do_clean:
+                keep = self.seen.add_new(hashes)
+                self.counts["duplicates"] += int((~keep).sum())
+                chunk, hashes = chunk[keep], hashes[keep]
+
+            is_test = hash_split(hashes, self.test_size, self.seed)
+            yield chunk[~is_test], chunk[is_test]
+
+    @profiled()
+    def fit_outliers(self, feature_names: list, do_clean: bool = True) -> OutlierCapper:
+        capper = OutlierCapper(sketch_size=self.config.sketch_size)
+        for train, _ in self.clean_split(do_clean):
+            if len(train):
+                capper.partial_fit(train[feature_names].to_numpy(dtype=np.float64))
+        logger.info(f"Capping bounds estimated from {capper.sketch.count} train rows "
+                    f"({sum(len(level) for level in capper.sketch.levels)} sketch rows per column)")
+        return capper
+
+    def run(self, do_clean: bool = True, do_outliers: bool = False):
+        with open_source(self.config.data_path) as source:
+            columns = list(pd.read_csv(source, nrows=0).columns)
+        feature_names = [col for col in columns if col != 'quality']
+        preprocessor = Preprocessor(feature_names=feature_names)
+        capper = self.fit_outliers(feature_names, do_clean) if do_outliers else None
+
+        writers = {
+            name: DatasetWriter(os.path.join(self.config.root_dir, f"{name}.csv"), target='quality',
+                                schema=self.config.all_schema, fmt=self.config.artifact_format,
+                                float32=self.config.float32, export_csv=self.config.export_csv)
+            for name in ("train", "test")
+        }
+        for train, test in self.clean_split(do_clean):
+            if capper is not None and len(train):
+                train[feature_names] = capper.transform(train[feature_names].to_numpy(dtype=np.float64, copy=True))
+            writers["train"].write(train)
+            writers["test"].write(test)
+
+        for writer in writers.values():
+            writer.close()
+        if capper is not None:
+            preprocessor.set_capping_bounds(capper.bounds(feature_names))
+        preprocessor.save(os.path.join(self.config.root_dir, self.config.preprocessor_name))
+
+        counts = self.counts
+        logger.info(f"Out-of-core transformation: {counts['rows']} rows read, {counts['nulls']} with nulls and "
+                    f"{counts['duplicates']} duplicates dropped, {writers['train'].rows} train / {writers['test'].rows} test "
+                    f"rows, row hash set {self.seen.nbytes / 1e6:.1f} MB in {len(self.seen.runs)} runs")
+        profiler.set_rows(rows_in=counts["rows"], rows_out=writers["train"].rows + writers["test"].rows)
+        return writers["train"].rows, writers["test"].rows
@@ -0,0 +1,253 @@
+import os
+import json
+import time
+import uuid
+import queue
+import shutil
+import threading
+from pathlib import Path
+from typing import Optional
+from end_to_end_project import logger
+from end_to_end_project.entity.config_entity import ModelEvaluationConfig
+
+
+def _write_json(path: Path, data: dict):
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=4, default=str)
+    os.replace(tmp_path, path)
+
+
+class LocalTracker:
+    """
+    Experiment tracking on the local filesystem, no server and no network.
+
+    Every run is a directory `<root_dir>/runs/<run_id>` with `meta.json`
+    (status, start/end time, tags), `params.json`, `metrics.jsonl` (one line
+    per value, appended) and the logged model files. Registered models are
+    versioned in `<root_dir>/registry.json`.
+    """
+
+    def __init__(self, root_dir: Path):
+        self.root_dir = Path(root_dir)
+        self.run_id = None
+        self.run_dir = None
+        self.meta = {}
+        self.params = {}
+
+    def start_run(self, tags: Optional[dict] = None) -> str:
+        self.run_id = uuid.uuid4().hex
+        self.run_dir = self.root_dir / "runs" / self.run_id
+        os.makedirs(self.run_dir)
+        self.meta = {"run_id": self.run_id, "status": "RUNNING", "start_time": time.time(), "end_time": None, "tags": tags or {}}
+        self.params = {}
+        _write_json(self.run_dir / "meta.json", self.meta)
+        return self.run_id
+
+    def log_batch(self, params: dict, metrics: list):
+        if params:
+            self.params.update(params)
+            _write_json(self.run_dir / "params.json", self.params)
+        if metrics:
+            lines = [json.dumps({"key": key, "value": float(value), "step": step, "timestamp": timestamp})
+                     for key, value, step, timestamp in metrics]
+            with open(self.run_dir / "metrics.jsonl", "a") as f:
+                f.write("\n".join(lines) + "\n")
+
+    def log_model(self, model, model_path: Path, name: str = "model", registered_model_name: Optional[str] = None):
+        # the model is already serialized by training, copy the file instead of pickling it again
+        model_dir = self.run_dir / name
+        os.makedirs(model_dir, exist_ok=True)
+        shutil.copy2(model_path, model_dir / Path(model_path).name)
+        if registered_model_name:
+            registry_path = self.root_dir / "registry.json"
+            registry = json.loads(registry_path.read_text()) if registry_path.exists() else {}
+            versions = registry.setdefault(registered_model_name, [])
+            versions.append({"version": len(versions) + 1, "run_id": self.run_id,
+                             "path": str(model_dir / Path(model_path).name), "created": time.time()})
+            _write_json(registry_path, registry)
+
+    def end_run(self, status: str = "FINISHED"):
+        self.meta.update(status=status, end_time=time.time())
+        _write_json(self.run_dir / "meta.json", self.meta)
+
+
+class MlflowTracker:
+    """
+    Remote MLflow tracking, with model registration; opt-in.
+
+    mlflow (and dagshub when `dagshub_repo` is set) are imported here, so they
+    are only needed when this backend is configured. Calls address the run by
+    id through `MlflowClient`, mlflow's active run being per thread.
+    """
+
+    def __init__(self, tracking_uri: Optional[str] = None, dagshub_repo: Optional[str] = None):
+        import mlflow
+        import mlflow.sklearn
+        from mlflow.entities import Metric, Param
+        self.mlflow = mlflow
+        self.Metric, self.Param = Metric, Param
+        if dagshub_repo:
+            from dagshub import init
+            repo_owner, repo_name = dagshub_repo.split("/")
+            init(repo_owner=repo_owner, repo_name=repo_name, mlflow=True)
+        if tracking_uri:
+            mlflow.set_tracking_uri(tracking_uri)
+        self.client = mlflow.tracking.MlflowClient()
+        self.run_id = None
+
+    def start_run(self, tags: Optional[dict] = None) -> str:
+        name = os.environ.get("MLFLOW_EXPERIMENT_NAME", "Default")
+        experiment = self.client.get_experiment_by_name(name)
+        # a fresh tracking server doesn't have the experiment yet
+        experiment_id = experiment.experiment_id if experiment is not None else self.client.create_experiment(name)
+        self.run_id = self.client.create_run(experiment_id, tags=tags).info.run_id
+        return self.run_id
+
+    def log_batch(self, params: dict, metrics: list):
+        # one request for the whole batch
+        self.client.log_batch(
+            self.run_id,
+            metrics=[self.Metric(key, float(value), int(timestamp * 1000), step) for key, value, step, timestamp in metrics],
+            params=[self.Param(key, str(value)) for key, value in params.items()]
+        )
+
+    def log_model(self, model, model_path: Path, name: str = "model", registered_model_name: Optional[str] = None):
+        # log_model works on the active run, make ours active in this thread
+        with self.mlflow.start_run(run_id=self.run_id):
+            self.mlflow.sklearn.log_model(model, name, registered_model_name=registered_model_name)
+
+    def end_run(self, status: str = "FINISHED"):
+        self.client.set_terminated(self.run_id, status=status)
+
+
+class AsyncTracker:
+    """
+    Non-blocking front for a tracking backend.
+
+    Logging calls only enqueue; a worker thread drains the queue in batches
+    of up to `batch_size` calls (waiting at most `flush_interval` seconds for
+    a batch to fill) and sends the params and metrics among them with one
+    `log_batch` backend call. Other calls (models, end of run) keep their
+    place in the order. `flush()` waits for the queue to drain; `close()`
+    also ends the run and re-raises the first backend error, so a failed
+    remote upload still fails the stage.
+    """
+
+    def __init__(self, backend, batch_size: int = 100, flush_interval: float = 1.0):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.run_id = None
+        self.errors = []
+        self._queue = queue.Queue()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="tracking", daemon=True)
+        self._worker.start()
+
+    def start_run(self, tags: Optional[dict] = None) -> str:
+        # synchronous, the run id is needed right away
+        self.run_id = self.backend.start_run(tags=tags)
+        return self.run_id
+
+    def _put(self, method: str, *args, **kwargs):
+        if self._closed:
+            raise RuntimeError("AsyncTracker is closed")
+        self._queue.put((method, args, kwargs))
+
+    def log_params(self, params: dict):
+        self._put("params", dict(params))
+
+    def log_metric(self, key: str, value: float, step: int = 0):
+        self._put("metrics", [(key, value, step, time.time())])
+
+    def log_metrics(self, metrics: dict, step: int = 0):
+        timestamp = time.time()
+        self._put("metrics", [(key, value, step, timestamp) for key, value in metrics.items()])
+
+    def log_model(self, model, model_path: Path, name: str = "model", registered_model_name: Optional[str] = None):
+        self._put("log_model", model, model_path, name=name, registered_model_name=registered_model_name)
+
+    def end_run(self, status: str = "FINISHED"):
+        self._put("end_run", status=status)
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.flush_interval
+        while batch[-1] is not None and len(batch) < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _call(self, method: str, *args, **kwargs):
+        try:
+            getattr(self.backend, method)(*args, **kwargs)
+        except Exception as e:
+            logger.exception(f"Tracking call {method} failed: {e}")
+            self.errors.append(e)
+
+    def _apply(self, batch: list):
+        params = {}
+        metrics = []
+
+        def flush_pending():
+            if params or metrics:
+                self._call("log_batch", dict(params), list(metrics))
+                params.clear()
+                metrics.clear()
+
+        for method, args, kwargs in batch:
+            if method == "params":
+                params.update(args[0])
+            elif method == "metrics":
+                metrics.extend(args[0])
+            else:
+                flush_pending()
+                self._call(method, *args, **kwargs)
+        flush_pending()
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            stop = batch[-1] is None
+            items = batch[:-1] if stop else batch
+            try:
+                self._apply(items)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def flush(self):
+        self._queue.join()
+
+    def close(self, status: str = "FINISHED"):
+        if self._closed:
+            return
+        if self.run_id is not None:
+            self.end_run(status=status)
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join()
+        if self.errors:
+            raise RuntimeError(f"{len(self.errors)} tracking call(s) failed") from self.errors[0]
+
+    def __enter__(self) -> "AsyncTracker":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(status="FAILED" if exc_type else "FINISHED")
+
+
+def get_tracker(config: ModelEvaluationConfig) -> AsyncTracker:
+    if config.tracking_backend == "local":
+        backend = LocalTracker(config.tracking_dir)
+    elif config.tracking_backend == "mlflow":
+        backend = MlflowTracker(tracking_uri=config.tracking_uri, dagshub_repo=config.dagshub_repo)
+    else:
+        raise ValueError(f"Unknown tracking backend '{config.tracking_backend}', expected local or mlflow")
+    return AsyncTracker(backend, batch_size=config.tracking_batch_size, flush_interval=config.tracking_flush_interval)
@@ -1,6 +1,31 @@
+import os
+from pathlib import Path
 from end_to_end_project.constants import *  # (CONFIG_FILE_PATH, PARAMS_FILE_PATH, SCHEMA_FILE_PATH)
 from end_to_end_project.utils.common import read_yaml, create_directories
-from end_to_end_project.entity.config_entity import DataIngestionConfig, DataValidationConfig, DataTransformationConfig, ModelTrainingConfig, ModelEvaluationConfig
+from end_to_end_project.entity.config_entity import DataIngestionConfig, DataValidationConfig, DataTransformationConfig, ModelTrainingConfig, ModelTuningConfig, ModelEvaluationConfig, PredictionConfig, BulkScoringConfig, LoggingConfig
+
+# absolute file paths: (stat of the files, (config, params, schema))
+_snapshots = {}
+
+
+def load_config_snapshot(config_filepath = CONFIG_FILE_PATH, params_filepath = PARAMS_FILE_PATH,
+                         schema_filepath = SCHEMA_FILE_PATH) -> tuple:
+    """
+    config.yaml, params.yaml and schema.yaml as frozen ConfigBoxes
+
+    The files are parsed and validated once per process. Later calls get the
+    same snapshot back as long as none of the files changed on disk; the
+    training sweep rewrites params.yaml, so the call after it re-reads.
+
+    Returns:
+        tuple: (config, params, schema)
+    """
+    paths = tuple(Path(path).resolve() for path in (config_filepath, params_filepath, schema_filepath))
+    stamp = tuple((stat.st_mtime_ns, stat.st_size) for stat in map(os.stat, paths))
+    cached = _snapshots.get(paths)
+    if cached is None or cached[0] != stamp:
+        cached = _snapshots[paths] = (stamp, tuple(read_yaml(path, frozen=True) for path in paths))
+    return cached[1]
 
 
 class ConfigurationManager:
@@ -11,9 +36,8 @@ class ConfigurationManager:
         schema_filepath = SCHEMA_FILE_PATH
     ):
     
-        self.config = read_yaml(config_filepath)
-        self.params = read_yaml(params_filepath)
-        self.schema = read_yaml(schema_filepath)
+        self.params_filepath = params_filepath
+        self.config, self.params, self.schema = load_config_snapshot(config_filepath, params_filepath, schema_filepath)
 
         create_directories([self.config.artifacts_root])
 
@@ -26,7 +50,12 @@ class ConfigurationManager:
             root_dir = config.root_dir,
             source_url = config.source_url,
             local_data_file = config.local_data_file,
-            unzip_dir = config.unzip_dir
+            unzip_dir = config.unzip_dir,
+            sha256 = config.sha256,
+            timeout = config.timeout,
+            retries = config.retries,
+            extract = config.extract,
+            fallback_timeout = config.fallback_timeout
         )
 
         return data_ingestion_config
@@ -41,7 +70,11 @@ class ConfigurationManager:
             root_dir = Path(config.root_dir),
             unzip_data_dir = Path(config.unzip_data_dir),
             STATUS_FILE = config.STATUS_FILE,
-            all_schema = schema
+            invalid_rows_file = Path(config.invalid_rows_file),
+            chunk_size = config.chunk_size,
+            max_examples = config.max_examples,
+            all_schema = schema,
+            ranges = self.schema.get("RANGES", {})
         )
 
         return data_validation_config
@@ -53,7 +86,21 @@ class ConfigurationManager:
 
         data_transformation_config = DataTransformationConfig(
             root_dir = Path(config.root_dir),
-            data_path = Path(config.data_path)
+            data_path = Path(config.data_path),
+            preprocessor_name = config.preprocessor_name,
+            artifact_format = config.artifact_format,
+            float32 = config.float32,
+            export_csv = config.export_csv,
+            mode = config.mode,
+            chunk_size = config.chunk_size,
+            sketch_size = config.sketch_size,
+            oversampling = config.oversampling,
+            oversampling_max_ratio = config.oversampling_max_ratio,
+            oversampling_n_jobs = config.oversampling_n_jobs,
+            power_n_jobs = config.power_n_jobs,
+            power_sample_size = config.power_sample_size,
+            power_tolerance = config.power_tolerance,
+            all_schema = self.schema.COLUMNS
         )
 
         return data_transformation_config
@@ -70,14 +117,45 @@ class ConfigurationManager:
             data_train_path= Path(config.data_train_path),
             data_test_path= Path(config.data_test_path),
             model_name = config.model_name,
+            linear_model_name = config.linear_model_name,
+            training_mode = config.training_mode,
+            checkpoint_name = config.checkpoint_name,
+            drift_report_name = config.drift_report_name,
+            drift_check_every = config.drift_check_every,
+            max_drift = config.max_drift,
+            max_stale_fraction = config.max_stale_fraction,
             alpha= params.alpha,
             l1_ratio= params.l1_ratio,
-            target_column= schema.name
-
+            target_column= schema.name,
+            all_schema= self.schema.COLUMNS
         )
 
         return model_training_config
     
+    def get_model_tuning_config(self) -> ModelTuningConfig:
+        config = self.config.model_tuning
+        params = self.params.ElasticNetSweep
+        schema = self.schema.TARGET_COLUMN
+
+        create_directories([config.root_dir])
+
+        model_tuning_config = ModelTuningConfig(
+            root_dir = Path(config.root_dir),
+            data_train_path = Path(config.data_train_path),
+            results_file = Path(config.results_file),
+            params_file = Path(self.params_filepath),
+            target_column = schema.name,
+            all_schema = self.schema.COLUMNS,
+            enabled = params.enabled,
+            l1_ratios = list(params.l1_ratios),
+            n_alphas = params.n_alphas,
+            alpha_min_ratio = params.alpha_min_ratio,
+            cv_folds = params.cv_folds,
+            n_jobs = params.n_jobs
+        )
+
+        return model_tuning_config
+    
     def get_model_evaluation_config(self) -> ModelEvaluationConfig:
         config = self.config.model_evaluation
         params = self.params.ElasticNet
@@ -90,8 +168,67 @@ class ConfigurationManager:
             data_test_path=config.data_test_path,
             model_path=config.model_path,
             metric_file=config.metric_file,
+            tracking_backend=config.tracking_backend,
+            tracking_dir=Path(config.tracking_dir),
+            tracking_uri=config.tracking_uri,
+            dagshub_repo=config.dagshub_repo,
+            registered_model_name=config.registered_model_name,
+            tracking_batch_size=config.tracking_batch_size,
+            tracking_flush_interval=config.tracking_flush_interval,
             all_params=params,
-            target_col=schema.name
+            target_col=schema.name,
+            all_schema=self.schema.COLUMNS
+        )
+
+        return model_eval_config
+    
+    def get_prediction_config(self) -> PredictionConfig:
+        config = self.config.prediction
+        target = self.schema.TARGET_COLUMN.name
+
+        prediction_config = PredictionConfig(
+            backend=config.backend,
+            model_path=Path(config.model_path),
+            linear_model_path=Path(config.linear_model_path),
+            preprocessor_path=Path(config.preprocessor_path),
+            reload_check_interval=float(config.reload_check_interval),
+            feature_columns=[col for col in self.schema.COLUMNS.keys() if col != target],
+            all_schema=self.schema.COLUMNS,
+            max_batch_size=int(config.max_batch_size),
+            micro_batching=bool(config.micro_batching),
+            micro_batch_size=int(config.micro_batch_size),
+            micro_batch_wait_ms=float(config.micro_batch_wait_ms),
+            micro_batch_timeout_s=float(config.micro_batch_timeout_s)
+        )
+
+        return prediction_config
+    
+    def get_bulk_scoring_config(self) -> BulkScoringConfig:
+        config = self.config.bulk_scoring
+        target = self.schema.TARGET_COLUMN.name
+
+        bulk_scoring_config = BulkScoringConfig(
+            chunk_size=int(config.chunk_size),
+            prediction_column=config.prediction_column,
+            workers=int(config.workers),
+            feature_columns=[col for col in self.schema.COLUMNS.keys() if col != target]
+        )
+
+        return bulk_scoring_config
+
+    def get_logging_config(self) -> LoggingConfig:
+        config = self.config.logging
+
+        logging_config = LoggingConfig(
+            level=config.level,
+            log_file=Path(config.log_file),
+            format=config.format,
+            max_bytes=int(config.max_bytes),
+            backup_count=int(config.backup_count),
+            rotate_when=config.rotate_when,
+            queue=bool(config.queue),
+            queue_size=int(config.queue_size),
+            full_policy=config.full_policy
         )
 
-        return model_eval_config
\ No newline at end of file
+        return logging_config
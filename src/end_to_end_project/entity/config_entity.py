@@ -7,18 +7,41 @@ class DataIngestionConfig:
     source_url: str
     local_data_file: Path
     unzip_dir: Path
+    sha256: str
+    timeout: float
+    retries: int
+    extract: bool
+    fallback_timeout: float
 
 @dataclass(frozen=True)
 class DataValidationConfig:
     root_dir:Path
     unzip_data_dir:Path
     STATUS_FILE:str
+    invalid_rows_file: Path
+    chunk_size: int
+    max_examples: int
     all_schema: dict
+    ranges: dict
 
 @dataclass(frozen=True)
 class DataTransformationConfig:
     root_dir: Path
     data_path: Path
+    preprocessor_name: str
+    artifact_format: str
+    float32: bool
+    export_csv: bool
+    mode: str
+    chunk_size: int
+    sketch_size: int
+    oversampling: str
+    oversampling_max_ratio: float
+    oversampling_n_jobs: int
+    power_n_jobs: int
+    power_sample_size: int
+    power_tolerance: float
+    all_schema: dict
 
 @dataclass(frozen=True)
 class ModelTrainingConfig:
@@ -26,9 +49,32 @@ class ModelTrainingConfig:
     data_train_path: Path
     data_test_path: Path
     model_name: str
+    linear_model_name: str
+    training_mode: str
+    checkpoint_name: str
+    drift_report_name: str
+    drift_check_every: int
+    max_drift: float
+    max_stale_fraction: float
     alpha: float
     l1_ratio: float
-    target_column: str 
+    target_column: str
+    all_schema: dict
+
+@dataclass(frozen=True)
+class ModelTuningConfig:
+    root_dir: Path
+    data_train_path: Path
+    results_file: Path
+    params_file: Path
+    target_column: str
+    all_schema: dict
+    enabled: bool
+    l1_ratios: list
+    n_alphas: int
+    alpha_min_ratio: float
+    cv_folds: int
+    n_jobs: int
 
 @dataclass(frozen=True)
 class ModelEvaluationConfig:
@@ -36,5 +82,49 @@ class ModelEvaluationConfig:
     data_test_path: Path
     model_path: Path
     metric_file: Path
+    tracking_backend: str
+    tracking_dir: Path
+    tracking_uri: str
+    dagshub_repo: str
+    registered_model_name: str
+    tracking_batch_size: int
+    tracking_flush_interval: float
     all_params: dict
-    target_col: str
\ No newline at end of file
+    target_col: str
+    all_schema: dict
+
+@dataclass(frozen=True)
+class PredictionConfig:
+    backend: str
+    model_path: Path
+    linear_model_path: Path
+    preprocessor_path: Path
+    reload_check_interval: float
+    feature_columns: list
+    all_schema: dict
+    max_batch_size: int
+    micro_batching: bool
+    micro_batch_size: int
+    micro_batch_wait_ms: float
+    micro_batch_timeout_s: float
+
+
+@dataclass(frozen=True)
+class BulkScoringConfig:
+    chunk_size: int
+    prediction_column: str
+    workers: int
+    feature_columns: list
+
+
+@dataclass(frozen=True)
+class LoggingConfig:
+    level: str
+    log_file: Path
+    format: str
+    max_bytes: int
+    backup_count: int
+    rotate_when: str
+    queue: bool
+    queue_size: int
+    full_policy: str
@@ -0,0 +1,57 @@
+import argparse
+from dataclasses import replace
+from end_to_end_project.config.configuration import ConfigurationManager
+from end_to_end_project.components.bulk_scoring import BulkScoring
+from end_to_end_project.pipeline.model_registry import ModelRegistry
+from end_to_end_project.pipeline.prediction import PredictionPipeline
+from end_to_end_project import logger, setup_logging
+
+STAGE_NAME = "Bulk Scoring"
+
+class BulkScoringPipeline:
+    def __init__(self, chunk_size: int = None, workers: int = None):
+        self.chunk_size = chunk_size
+        self.workers = workers
+
+    def main(self, input_paths, output_path, resume=False, keep_columns=None):
+        config = ConfigurationManager()
+        bulk_scoring_config = config.get_bulk_scoring_config()
+        if self.chunk_size:
+            bulk_scoring_config = replace(bulk_scoring_config, chunk_size=self.chunk_size)
+        if self.workers:
+            bulk_scoring_config = replace(bulk_scoring_config, workers=self.workers)
+        prediction_config = config.get_prediction_config()
+        if isinstance(input_paths, str):
+            input_paths = [input_paths]
+
+        if bulk_scoring_config.workers > 1 or len(input_paths) > 1:
+            # the workers load the model themselves
+            bulk_scoring = BulkScoring(config=bulk_scoring_config, predict_fn=None)
+            return bulk_scoring.score_files(input_paths, output_path, workers=bulk_scoring_config.workers,
+                                            prediction_config=prediction_config, resume=resume, keep_columns=keep_columns)
+
+        model = ModelRegistry(config=prediction_config).load().model
+        prediction = PredictionPipeline(model=model, feature_columns=bulk_scoring_config.feature_columns)
+        bulk_scoring = BulkScoring(config=bulk_scoring_config, predict_fn=prediction.predict)
+        return bulk_scoring.score_file(input_paths[0], output_path, resume=resume, keep_columns=keep_columns)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score large CSV/Parquet files in bounded memory")
+    parser.add_argument("inputs", nargs="+", help="input .csv or .parquet file(s) with the schema.yaml feature columns")
+    parser.add_argument("output", help="output .csv file, or .parquet directory of part files")
+    parser.add_argument("--chunk-size", type=int, default=None, help="rows per chunk (default: bulk_scoring.chunk_size)")
+    parser.add_argument("--workers", type=int, default=None, help="processes to score with (default: bulk_scoring.workers)")
+    parser.add_argument("--resume", action="store_true", help="continue after the last finished chunk of a previous run")
+    parser.add_argument("--keep-columns", default="", help="comma separated input columns to copy next to the predictions")
+    args = parser.parse_args()
+    setup_logging(ConfigurationManager().get_logging_config())
+
+    try:
+        logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
+        obj = BulkScoringPipeline(chunk_size=args.chunk_size, workers=args.workers)
+        obj.main(args.inputs, args.output, resume=args.resume,
+                 keep_columns=[col for col in args.keep_columns.split(",") if col])
+        logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<")
+    except Exception as e:
+        logger.exception(e)
+        raise e
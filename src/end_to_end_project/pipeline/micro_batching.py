@@ -0,0 +1,172 @@
+import time
+import queue
+import bisect
+import threading
+import numpy as np
+from concurrent.futures import Future
+from typing import Callable, Optional
+from end_to_end_project import logger
+from end_to_end_project.entity.config_entity import PredictionConfig
+from end_to_end_project.pipeline.prediction import PredictionPipeline
+
+
+# upper bounds (inclusive) of the histogram buckets, the last bucket is +Inf
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+QUEUE_DELAY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100)
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def as_dict(self) -> dict:
+        labels = [str(b) for b in self.buckets] + ["+Inf"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "max": self.max
+        }
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single-row predictions into one matrix call.
+
+    Callers `submit()` a feature row and get a Future back. A worker thread
+    takes the first waiting row, then keeps collecting until it has
+    `max_batch_size` rows or `max_wait_ms` has passed since that first row,
+    scores the stacked rows with one `predict_fn` call and resolves every
+    caller's Future with its own prediction. Rows still queued when the
+    batcher is closed fail with RuntimeError instead of waiting forever.
+    """
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], np.ndarray], max_batch_size: int = 64, max_wait_ms: float = 2.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._stopped = threading.Event()
+        # submit and close take it, so no row is queued once close has started
+        self._lock = threading.Lock()
+        # the histograms are only written by the worker thread
+        self.batch_sizes = _Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_delays_ms = _Histogram(QUEUE_DELAY_BUCKETS_MS)
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, row) -> Future:
+        row = np.asarray(row, dtype=np.float64).ravel()
+        future = Future()
+        with self._lock:
+            if self._stopped.is_set():
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.put((row, future, time.perf_counter()))
+        return future
+
+    def predict(self, row, timeout: Optional[float] = None):
+        return self.submit(row).result(timeout=timeout)
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        if batch[0] is None:
+            return []
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # closing: score what we have, the worker exits on the next pass
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                return
+
+            started = time.perf_counter()
+            for _, _, enqueued in batch:
+                self.queue_delays_ms.observe((started - enqueued) * 1000.0)
+            self.batch_sizes.observe(len(batch))
+
+            try:
+                X = np.vstack([row for row, _, _ in batch])
+                predictions = self.predict_fn(X)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future, _), prediction in zip(batch, predictions):
+                future.set_result(prediction)
+
+    def stats(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "pending": self._queue.qsize(),
+            "batch_size": self.batch_sizes.as_dict(),
+            "queue_delay_ms": self.queue_delays_ms.as_dict()
+        }
+
+    def close(self):
+        with self._lock:
+            if self._stopped.is_set():
+                return
+            self._stopped.set()
+            self._queue.put(None)
+        self._worker.join()
+        # rows queued behind the stop marker are never scored, fail them
+        abandoned = 0
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[1].set_exception(RuntimeError("MicroBatcher is closed"))
+                abandoned += 1
+        if abandoned:
+            logger.warning(f"Micro-batcher closed with {abandoned} rows still queued, failed them")
+        logger.info(f"Micro-batcher stopped: {self.stats()}")
+
+
+_batcher: Optional[MicroBatcher] = None
+_batcher_lock = threading.Lock()
+
+
+def get_micro_batcher(config: PredictionConfig) -> MicroBatcher:
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = MicroBatcher(
+                    predict_fn=lambda X: PredictionPipeline().predict(X),
+                    max_batch_size=config.micro_batch_size,
+                    max_wait_ms=config.micro_batch_wait_ms
+                )
+                logger.info(f"Micro-batching enabled: max_batch_size={config.micro_batch_size}, max_wait_ms={config.micro_batch_wait_ms}")
+    return _batcher
+
+
+def current_micro_batcher() -> Optional[MicroBatcher]:
+    """The running micro-batcher, None when no request has needed one yet."""
+    return _batcher
@@ -0,0 +1,170 @@
+import os
+import time
+import hashlib
+import threading
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Optional
+from end_to_end_project import logger
+from end_to_end_project.config.configuration import ConfigurationManager
+from end_to_end_project.entity.config_entity import PredictionConfig
+from end_to_end_project.components.linear_scorer import LinearScorer
+from end_to_end_project.components.preprocessor import Preprocessor, PreprocessedModel
+from end_to_end_project.utils.common import get_schema_hash
+
+
+@dataclass(frozen=True)
+class ModelVersion:
+    model: Any
+    version: str
+    path: Path
+    stat_key: tuple
+    load_time: float
+    loaded_at: float
+
+
+def _joblib_load(path: Path) -> Any:
+    # joblib (and scikit-learn with the model) is only imported by the sklearn backend
+    import joblib
+    return joblib.load(path)
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Process-wide holder of the serving model.
+
+    The model is loaded once and kept in memory. `get()` checks the artifacts
+    (the model and, when present, the fitted preprocessor in front of it) at
+    most every `reload_check_interval` seconds: a cheap stat first, then a
+    content hash only when mtime or size moved. A new version is loaded off to
+    the side and swapped in with a single reference assignment, so callers that
+    already hold the previous `ModelVersion` keep using it until they finish.
+    """
+
+    def __init__(self, config: PredictionConfig, loader: Optional[Callable[[Path], Any]] = None):
+        self.config = config
+        if config.backend == "linear":
+            schema_hash = get_schema_hash(config.all_schema)
+            self.model_path = Path(config.linear_model_path)
+            self.loader = loader or (lambda path: LinearScorer.load(path, expected_schema_hash=schema_hash))
+        elif config.backend == "sklearn":
+            self.model_path = Path(config.model_path)
+            self.loader = loader or _joblib_load
+        else:
+            raise ValueError(f"Unknown prediction backend: {config.backend}")
+        self.preprocessor_path = Path(config.preprocessor_path)
+        self.reload_check_interval = config.reload_check_interval
+        self._current: Optional[ModelVersion] = None
+        self._last_check = 0.0
+        self._reload_lock = threading.Lock()
+
+    def _stat_key(self) -> tuple:
+        stat = os.stat(self.model_path)
+        key = [(stat.st_mtime, stat.st_size)]
+        if self.preprocessor_path.exists():
+            stat = os.stat(self.preprocessor_path)
+            key.append((stat.st_mtime, stat.st_size))
+        return tuple(key)
+
+    def _version(self) -> str:
+        version = file_sha256(self.model_path)
+        if self.preprocessor_path.exists():
+            version = hashlib.sha256((version + file_sha256(self.preprocessor_path)).encode()).hexdigest()
+        return version[:12]
+
+    def _load(self, version: str, stat_key: tuple) -> ModelVersion:
+        start = time.perf_counter()
+        model = self.loader(self.model_path)
+        if self.preprocessor_path.exists():
+            preprocessor = Preprocessor.load(self.preprocessor_path)
+            if preprocessor.feature_names != list(self.config.feature_columns):
+                raise ValueError(f"Preprocessor {self.preprocessor_path} was fitted on columns {preprocessor.feature_names}")
+            if not preprocessor.is_identity:
+                model = PreprocessedModel(preprocessor, model)
+        load_time = time.perf_counter() - start
+        return ModelVersion(
+            model=model,
+            version=version,
+            path=self.model_path,
+            stat_key=stat_key,
+            load_time=load_time,
+            loaded_at=time.time()
+        )
+
+    def load(self) -> ModelVersion:
+        with self._reload_lock:
+            stat_key = self._stat_key()
+            version = self._version()
+            self._current = self._load(version, stat_key)
+            self._last_check = time.monotonic()
+        logger.info(f"Loaded model {self.model_path} version {version} in {self._current.load_time * 1000:.1f} ms")
+        return self._current
+
+    def refresh(self) -> bool:
+        """Reload the model if the artifact changed. Returns True when a new version was swapped in."""
+        if self._current is None:
+            # nothing loaded yet (called before startup loading): load instead of comparing
+            self.load()
+            return True
+        # only one thread does the stat/hash/load; the others keep serving the current version
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            self._last_check = time.monotonic()
+            current = self._current
+            try:
+                stat_key = self._stat_key()
+                if stat_key == current.stat_key:
+                    return False
+                version = self._version()
+            except FileNotFoundError:
+                logger.warning(f"Model artifact {self.model_path} is missing, keeping version {current.version}")
+                return False
+
+            if version == current.version:
+                # touched but identical content, remember the new stat so we don't rehash
+                self._current = replace(current, stat_key=stat_key)
+                return False
+
+            try:
+                new = self._load(version, stat_key)
+            except Exception as e:
+                # most likely a half-written artifact, try again on the next check
+                logger.warning(f"Failed to load model version {version}, keeping {current.version}: {e}")
+                return False
+
+            self._current = new
+            logger.info(f"Reloaded model {self.model_path}: {current.version} -> {new.version} in {new.load_time * 1000:.1f} ms")
+            return True
+        finally:
+            self._reload_lock.release()
+
+    def get(self) -> ModelVersion:
+        if self._current is None:
+            return self.load()
+        if time.monotonic() - self._last_check >= self.reload_check_interval:
+            self.refresh()
+        return self._current
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry(config: Optional[PredictionConfig] = None) -> ModelRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                if config is None:
+                    config = ConfigurationManager().get_prediction_config()
+                _registry = ModelRegistry(config=config)
+    return _registry
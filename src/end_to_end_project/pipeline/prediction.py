@@ -1,13 +1,89 @@
-import pandas as pd
+import math
 import numpy as np
-from pathlib import Path
-import joblib
+from end_to_end_project.pipeline.model_registry import get_model_registry
 
 class PredictionPipeline:
-    def __init__(self):
-        self.model = joblib.load(Path("artifacts/model_training/model.joblib"))
+    def __init__(self, model=None, feature_columns=None):
+        # the model comes from the process-wide registry unless one is given,
+        # so building a pipeline per request no longer unpickles the artifact
+        if model is None:
+            model_version = get_model_registry().get()
+            model = model_version.model
+            self.model_version = model_version.version
+        else:
+            self.model_version = None
+        self.model = model
+        self.feature_columns = feature_columns or get_model_registry().config.feature_columns
 
     def predict(self, input_data):
         prediction = np.round(self.model.predict(input_data), 0)
 
-        return prediction
\ No newline at end of file
+        return prediction
+
+    def validate_records(self, records: list):
+        """
+        Turn feature records into a matrix in schema column order
+
+        Args:
+            records (list): list of {column name: value} dicts
+
+        Returns:
+            tuple: (float matrix of the valid rows, their positions in records, {position: error message})
+        """
+        columns = self.feature_columns
+        rows, positions, errors = [], [], {}
+
+        for i, record in enumerate(records):
+            if not isinstance(record, dict):
+                errors[i] = "record must be an object of column name to value"
+                continue
+
+            missing = [col for col in columns if col not in record]
+            if missing:
+                errors[i] = f"missing columns: {missing}"
+                continue
+
+            row = []
+            for col in columns:
+                value = record[col]
+                try:
+                    number = float(value) if not isinstance(value, bool) else math.nan
+                except (TypeError, ValueError):
+                    number = math.nan
+                if not math.isfinite(number):
+                    errors[i] = f"invalid value for '{col}': {value!r}"
+                    break
+                row.append(number)
+            if i in errors:
+                continue
+
+            rows.append(row)
+            positions.append(i)
+
+        X = np.array(rows, dtype=np.float64).reshape(len(rows), len(columns))
+        return X, positions, errors
+
+    def predict_records(self, records: list) -> list:
+        """
+        Score many records with a single vectorized model call
+
+        Args:
+            records (list): list of {column name: value} dicts
+
+        Returns:
+            list: one {"prediction": ...} or {"error": ...} entry per record, in input order
+        """
+        X, positions, errors = self.validate_records(records)
+        predictions = self.predict(X) if len(positions) > 0 else []
+        return self.merge_results(len(records), positions, predictions, errors)
+
+    @staticmethod
+    def merge_results(n_records: int, positions: list, predictions, errors: dict) -> list:
+        """Predictions of the valid rows and errors of the others, back in input order"""
+        results = [None] * n_records
+        for i, prediction in zip(positions, np.asarray(predictions).tolist()):
+            results[i] = {"prediction": prediction}
+        for i, error in errors.items():
+            results[i] = {"error": error}
+
+        return results
@@ -0,0 +1,321 @@
+import os
+import json
+import time
+import hashlib
+import importlib
+import importlib.util
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+from end_to_end_project import logger
+from end_to_end_project.constants import CONFIG_FILE_PATH, PARAMS_FILE_PATH, SCHEMA_FILE_PATH
+from end_to_end_project.config.configuration import load_config_snapshot
+from end_to_end_project.utils.data_io import resolve_dataset_path
+from end_to_end_project.utils.archive import source_signature
+from end_to_end_project.utils.artifact_store import DiskArtifactStore, MemoryArtifactStore, set_artifact_store
+from end_to_end_project.utils.profiling import profiler, compare_reports, log_comparison, path_bytes
+
+# code every stage depends on, a change here re-runs the whole pipeline
+SHARED_MODULES = (
+    "end_to_end_project.config.configuration",
+    "end_to_end_project.entity.config_entity",
+    "end_to_end_project.utils.common",
+    "end_to_end_project.utils.archive",
+    "end_to_end_project.utils.artifact_store",
+    "end_to_end_project.utils.profiling",
+)
+
+
+@dataclass(frozen=True)
+class Stage:
+    key: str
+    name: str
+    pipeline: str
+    modules: tuple
+    config_sections: tuple
+    inputs: Callable
+    outputs: Callable
+    params_sections: tuple = ()
+    uses_schema: bool = False
+    # stages that check an external source themselves run every time; the stages
+    # after them are still only invalidated when their outputs' content changes
+    always_run: bool = False
+
+
+STAGES = (
+    Stage(
+        key="data_ingestion",
+        name="Data Ingestion Stage",
+        pipeline="end_to_end_project.pipeline.stage_01_data_ingestion:DataIngestionPipeline",
+        modules=("end_to_end_project.pipeline.stage_01_data_ingestion", "end_to_end_project.components.data_ingestion"),
+        config_sections=("data_ingestion",),
+        inputs=lambda c: [],
+        outputs=lambda c: [c.data_ingestion.local_data_file, c.data_validation.unzip_data_dir],
+        always_run=True
+    ),
+    Stage(
+        key="data_validation",
+        name="Data Validation Stage",
+        pipeline="end_to_end_project.pipeline.stage_02_data_validation:DataValidationPipeline",
+        modules=("end_to_end_project.pipeline.stage_02_data_validation", "end_to_end_project.components.data_validation"),
+        config_sections=("data_validation",),
+        uses_schema=True,
+        inputs=lambda c: [c.data_validation.unzip_data_dir],
+        outputs=lambda c: [c.data_validation.STATUS_FILE]
+    ),
+    Stage(
+        key="data_transformation",
+        name="Data Transformation Stage",
+        pipeline="end_to_end_project.pipeline.stage_03_data_transformation:DataTransformationPipeline",
+        modules=("end_to_end_project.pipeline.stage_03_data_transformation", "end_to_end_project.components.data_transformation",
+                 "end_to_end_project.components.preprocessor", "end_to_end_project.components.streaming_transformation",
+                 "end_to_end_project.components.outlier_capping", "end_to_end_project.components.oversampling",
+                 "end_to_end_project.components.power_transform", "end_to_end_project.utils.data_io"),
+        config_sections=("data_transformation",),
+        uses_schema=True,
+        inputs=lambda c: [c.data_transformation.data_path, c.data_validation.STATUS_FILE],
+        outputs=lambda c: [resolve_dataset_path(c.model_training.data_train_path),
+                           resolve_dataset_path(c.model_training.data_test_path),
+                           os.path.join(c.data_transformation.root_dir, c.data_transformation.preprocessor_name)]
+    ),
+    Stage(
+        key="model_training",
+        name="Model Training Stage",
+        pipeline="end_to_end_project.pipeline.stage_04_model_training:ModelTrainingPipeline",
+        modules=("end_to_end_project.pipeline.stage_04_model_training", "end_to_end_project.components.model_training",
+                 "end_to_end_project.components.linear_scorer", "end_to_end_project.components.model_tuning",
+                 "end_to_end_project.components.incremental_training"),
+        config_sections=("model_training", "model_tuning"),
+        params_sections=("ElasticNet", "ElasticNetSweep"),
+        uses_schema=True,
+        inputs=lambda c: [resolve_dataset_path(c.model_training.data_train_path),
+                          resolve_dataset_path(c.model_training.data_test_path)],
+        outputs=lambda c: [os.path.join(c.model_training.root_dir, c.model_training.model_name),
+                           os.path.join(c.model_training.root_dir, c.model_training.linear_model_name),
+                           os.path.join(c.model_training.root_dir, c.model_training.checkpoint_name)]
+    ),
+    Stage(
+        key="model_evaluation",
+        name="Model Evaluation Stage",
+        pipeline="end_to_end_project.pipeline.stage_05_model_evaluation:ModelEvaluationPipeline",
+        modules=("end_to_end_project.pipeline.stage_05_model_evaluation", "end_to_end_project.components.model_evaluation",
+                 "end_to_end_project.components.tracking"),
+        config_sections=("model_evaluation",),
+        params_sections=("ElasticNet",),
+        uses_schema=True,
+        inputs=lambda c: [resolve_dataset_path(c.model_evaluation.data_test_path), c.model_evaluation.model_path],
+        outputs=lambda c: [c.model_evaluation.metric_file]
+    ),
+)
+
+
+class PipelineRunner:
+    """
+    Runs the stages in order and skips the ones that are up to date.
+
+    A stage's fingerprint hashes its code (pipeline + component modules and the
+    shared config/utils code), its config.yaml / params.yaml / schema.yaml
+    sections and the content of its input artifacts. When the fingerprint
+    matches the last successful run and all outputs still exist the stage is
+    skipped. A stage that re-runs changes its outputs, which changes the inputs
+    of the stages after it, so invalidation flows down the DAG on its own.
+
+    Every stage that runs is profiled (wall and CPU time, peak RSS, rows, the
+    size of its outputs, plus the steps the components mark), and the run
+    report is written to `pipeline_runner.run_report`. The report of the run
+    before is kept next to it as `*.previous.json` for `compare_with_previous`.
+    """
+
+    def __init__(self, stages: tuple = STAGES, config_filepath=CONFIG_FILE_PATH,
+                 params_filepath=PARAMS_FILE_PATH, schema_filepath=SCHEMA_FILE_PATH):
+        self.stages = stages
+        self.filepaths = (Path(config_filepath), Path(params_filepath), Path(schema_filepath))
+        self._read_config()
+        self.state_file = Path(self.config.pipeline_runner.state_file)
+        self.state = self._load_state()
+        self.report_file = Path(self.config.pipeline_runner.run_report)
+        self.previous_report_file = self.report_file.with_suffix(".previous.json")
+        self.report = None
+
+    def _read_config(self):
+        self.config, self.params, self.schema = load_config_snapshot(*self.filepaths)
+
+    def _load_state(self) -> dict:
+        if self.state_file.exists():
+            with open(self.state_file) as f:
+                return json.load(f)
+        return {"stages": {}, "file_hashes": {}}
+
+    def _save_state(self):
+        os.makedirs(self.state_file.parent, exist_ok=True)
+        tmp_path = self.state_file.with_name(self.state_file.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f, indent=4)
+        os.replace(tmp_path, self.state_file)
+
+    def file_hash(self, path) -> str:
+        # a member read straight from an archive hashes as its CRC, other members don't matter
+        signature = source_signature(path)
+        if signature is not None:
+            return signature
+        path = str(path)
+        if not os.path.exists(path):
+            return "missing"
+        if os.path.isdir(path):
+            # directory artifacts (npy datasets) hash as the list of their files' hashes
+            entries = sorted(os.listdir(path))
+            content = json.dumps([[name, self.file_hash(os.path.join(path, name))] for name in entries])
+            return hashlib.sha256(content.encode("utf-8")).hexdigest()
+        stat = os.stat(path)
+        cached = self.state["file_hashes"].get(path)
+        # rehash only when mtime or size moved
+        if cached and cached["mtime"] == stat.st_mtime and cached["size"] == stat.st_size:
+            return cached["sha256"]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self.state["file_hashes"][path] = {"mtime": stat.st_mtime, "size": stat.st_size, "sha256": digest.hexdigest()}
+        return digest.hexdigest()
+
+    def fingerprint(self, stage: Stage) -> str:
+        parts = {
+            "code": {module: self.file_hash(importlib.util.find_spec(module).origin)
+                     for module in SHARED_MODULES + stage.modules},
+            "config": {section: self.config[section].to_dict() for section in stage.config_sections},
+            "params": {section: self.params[section].to_dict() for section in stage.params_sections},
+            "schema": self.schema.to_dict() if stage.uses_schema else None,
+            "inputs": {str(path): self.file_hash(path) for path in stage.inputs(self.config)}
+        }
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def is_up_to_date(self, stage: Stage, fingerprint: str) -> bool:
+        last = self.state["stages"].get(stage.key)
+        if not last or last["fingerprint"] != fingerprint:
+            return False
+        return all(os.path.exists(path) for path in stage.outputs(self.config))
+
+    def run_stage(self, stage: Stage):
+        module_name, class_name = stage.pipeline.split(":")
+        # stage modules are imported only when they actually run
+        pipeline_class = getattr(importlib.import_module(module_name), class_name)
+        pipeline_class().main()
+
+    def create_artifact_store(self):
+        """The store stages hand their datasets and model through, per `pipeline_runner.artifact_store` / `persist`."""
+        runner_config = self.config.pipeline_runner
+        kind = runner_config.get("artifact_store", "disk")
+        if kind == "memory":
+            return MemoryArtifactStore(persist=runner_config.get("persist", "async"))
+        if kind == "disk":
+            return DiskArtifactStore()
+        raise ValueError(f"Unknown artifact_store '{kind}', expected memory or disk")
+
+    def run(self, force: bool = False, from_stage: Optional[str] = None) -> dict:
+        keys = [stage.key for stage in self.stages]
+        if from_stage is not None and from_stage not in keys:
+            raise ValueError(f"Unknown stage '{from_stage}', expected one of {keys}")
+
+        store = self.create_artifact_store()
+        previous_store = set_artifact_store(store)
+        try:
+            return self._run_stages(store, force, from_stage)
+        finally:
+            set_artifact_store(previous_store)
+            store.close()
+
+    def _run_stages(self, store, force: bool, from_stage: Optional[str]) -> dict:
+        # with persist: end nothing is written until the run is over, so the stages
+        # are recorded then, once their outputs can be hashed
+        defer = isinstance(store, MemoryArtifactStore) and store.persist == "end"
+        deferred = []
+        forced = force
+        summary = {}
+        self.report = {"started_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "finished_at": None, "status": "running", "stages": []}
+        profiler.take()
+        for stage in self.stages:
+            # an artifact still waiting to be written leaves stale files for the
+            # fingerprint to hash, so everything after it runs
+            forced = forced or stage.key == from_stage or store.has_pending()
+            fingerprint = self.fingerprint(stage)
+            if not forced and not stage.always_run and self.is_up_to_date(stage, fingerprint):
+                logger.info(f">>>>>> stage {stage.name} skipped (up to date) <<<<<<")
+                summary[stage.key] = "skipped"
+                self.report["stages"].append({"name": stage.key, "status": "skipped"})
+                continue
+
+            try:
+                logger.info(f">>>>>> stage {stage.name} started <<<<<<")
+                # outputs are resolved after the stage, the format it wrote decides the path
+                with profiler.profile(stage.key, artifacts=lambda: stage.outputs(self.config)) as record:
+                    self.run_stage(stage)
+                    if not defer:
+                        # the next stage's fingerprint hashes these outputs
+                        store.wait()
+                self.report["stages"].append(profiler.take()[0])
+                logger.info(f">>>>>> stage {stage.name} completed <<<<<<")
+            except Exception as e:
+                logger.exception(e)
+                self.report["stages"].extend(profiler.take())
+                self.state["stages"].pop(stage.key, None)
+                try:
+                    self._record_deferred(store, deferred)
+                finally:
+                    self.write_report(status="failed")
+                    self._save_state()
+                raise e
+
+            summary[stage.key] = "ran"
+            if defer:
+                deferred.append((stage, record))
+                continue
+            self._record_stage(stage, record["wall_seconds"])
+            self._save_state()
+
+        self._record_deferred(store, deferred)
+        self._save_state()
+        self.write_report(status="finished")
+        return summary
+
+    def _record_stage(self, stage: Stage, duration: float):
+        # a stage may write back to params.yaml (the training sweep does), so
+        # re-read the files and record the fingerprint of the state it left behind
+        self._read_config()
+        fingerprint = self.fingerprint(stage)
+        for path in stage.outputs(self.config):
+            self.file_hash(path)
+        self.state["stages"][stage.key] = {
+            "fingerprint": fingerprint,
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "duration_seconds": duration
+        }
+
+    def _record_deferred(self, store, deferred: list):
+        """Write the artifacts the store still holds, then record the stages that produced them."""
+        store.wait()
+        for stage, record in deferred:
+            self._record_stage(stage, record["wall_seconds"])
+            # the outputs didn't exist yet when the stage's profile was closed
+            record["artifact_bytes"] = {str(path): path_bytes(path) for path in stage.outputs(self.config)}
+        deferred.clear()
+
+    def write_report(self, status: str):
+        self.report.update(status=status, finished_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        os.makedirs(self.report_file.parent, exist_ok=True)
+        if self.report_file.exists():
+            os.replace(self.report_file, self.previous_report_file)
+        tmp_path = self.report_file.with_name(self.report_file.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.report, f, indent=4)
+        os.replace(tmp_path, self.report_file)
+        logger.info(f"Run report written to {self.report_file}")
+
+    def compare_with_previous(self) -> list:
+        """Log and return the changes against the run report before this one; empty when there is none."""
+        if self.report is None or not self.previous_report_file.exists():
+            logger.info("No previous run report to compare with")
+            return []
+        with open(self.previous_report_file) as f:
+            rows = compare_reports(json.load(f), self.report)
+        log_comparison(rows)
+        return rows
@@ -0,0 +1,207 @@
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from typing import Optional
+from end_to_end_project import logger
+
+
+# upper bounds (inclusive) of the latency buckets in seconds, the last bucket is +Inf
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# name: (type, help) of everything /metrics exposes
+METRICS = {
+    "serving_requests_total": ("counter", "HTTP requests by route, method and status code."),
+    "serving_errors_total": ("counter", "Failed requests by route and error (exception class or rejection reason)."),
+    "serving_request_duration_seconds": ("histogram", "Request latency by route, from routing to the response."),
+    "serving_request_phase_seconds": ("histogram", "Request latency by route and phase: parse, model, render."),
+    "serving_model_info": ("gauge", "The model version being served, always 1."),
+    "serving_model_load_seconds": ("gauge", "Time it took to load the model version being served."),
+    "serving_model_loaded_timestamp_seconds": ("gauge", "Unix time the model version being served was loaded."),
+    "serving_micro_batch_pending": ("gauge", "Rows waiting in the micro-batcher queue."),
+    "serving_micro_batch_size": ("histogram", "Rows per micro-batched model call."),
+    "serving_micro_batch_queue_delay_seconds": ("histogram", "Time a row waited in the micro-batcher queue."),
+    "serving_log_records_dropped_total": ("counter", "Log records dropped because the log queue was full."),
+}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Shard:
+    """Counters and histograms of one thread; only that thread writes to them."""
+
+    def __init__(self, thread: Optional[threading.Thread] = None):
+        self.thread = thread
+        self.counters = {}
+        # (name, labels): [count per bucket..., +Inf count, sum]
+        self.histograms = {}
+
+    def merge(self, counters: dict, histograms: dict):
+        for key, value in counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+        for key, values in histograms.items():
+            mine = self.histograms.setdefault(key, [0] * len(values))
+            for i, value in enumerate(values):
+                mine[i] += value
+
+
+class ServingMetrics:
+    """
+    Request counters and latency histograms of the serving app, in Prometheus text format.
+
+    Every thread records into its own shard, so the request path takes no
+    lock and never contends with other requests or with a scrape; the lock
+    is only taken the first time a thread records anything. `render()`
+    (the /metrics scrape) sums the shards, and folds the shards of threads
+    that have exited into one, so a server that starts a thread per request
+    doesn't keep a shard per request. A scrape can see a histogram whose
+    count is one observation ahead of its sum, which is harmless. Metrics
+    are per process: with several worker processes, scrape each one.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._shards = []
+        self._retired = _Shard()
+        self._lock = threading.Lock()
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard(threading.current_thread())
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def inc(self, name: str, labels: tuple = (), value: float = 1):
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: tuple, value: float):
+        histograms = self._shard().histograms
+        key = (name, labels)
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = [0] * (len(self.buckets) + 2)
+        histogram[bisect.bisect_left(self.buckets, value)] += 1
+        histogram[-1] += value
+
+    def observe_request(self, route: str, method: str, status: int, seconds: float):
+        self.inc("serving_requests_total", (("route", route), ("method", method), ("status", str(status))))
+        self.observe("serving_request_duration_seconds", (("route", route),), seconds)
+
+    def count_error(self, route: str, error: str):
+        self.inc("serving_errors_total", (("route", route), ("error", error)))
+
+    @contextmanager
+    def phase(self, route: str, phase: str):
+        """Time the enclosed block as one phase of a request, also when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("serving_request_phase_seconds", (("route", route), ("phase", phase)), time.perf_counter() - start)
+
+    def collect(self) -> tuple:
+        """Sum of every shard: ({(name, labels): value}, {(name, labels): [bucket counts..., sum]})."""
+        with self._lock:
+            alive = []
+            for shard in self._shards:
+                if shard.thread.is_alive():
+                    alive.append(shard)
+                else:
+                    # the thread is gone, nothing writes to its shard anymore
+                    self._retired.merge(shard.counters, shard.histograms)
+            self._shards = alive
+            total = _Shard()
+            total.merge(self._retired.counters, self._retired.histograms)
+            for shard in alive:
+                # dict.copy() is atomic against the owning thread adding a key
+                total.merge(shard.counters.copy(), {key: list(values) for key, values in shard.histograms.copy().items()})
+        return total.counters, total.histograms
+
+    def _model_samples(self) -> list:
+        from end_to_end_project.pipeline.model_registry import get_model_registry
+        try:
+            registry = get_model_registry()
+            current = registry.get()
+        except Exception as e:
+            logger.warning(f"No model version for /metrics: {e}")
+            return []
+        info = (("version", current.version), ("backend", registry.config.backend), ("path", str(current.path)))
+        return [
+            ("serving_model_info", info, 1),
+            ("serving_model_load_seconds", (), current.load_time),
+            ("serving_model_loaded_timestamp_seconds", (), current.loaded_at),
+        ]
+
+    @staticmethod
+    def _micro_batcher_samples() -> tuple:
+        from end_to_end_project.pipeline.micro_batching import current_micro_batcher
+        batcher = current_micro_batcher()
+        if batcher is None:
+            return [], {}
+        histograms = {}
+        # the batcher keeps its queue delays in milliseconds
+        for name, histogram, divisor in (("serving_micro_batch_size", batcher.batch_sizes, 1),
+                                         ("serving_micro_batch_queue_delay_seconds", batcher.queue_delays_ms, 1000)):
+            histograms[name] = ([bound / divisor for bound in histogram.buckets], list(histogram.counts), histogram.sum / divisor)
+        return [("serving_micro_batch_pending", (), batcher.stats()["pending"])], histograms
+
+    def render(self) -> str:
+        counters, histograms = self.collect()
+        samples = {}
+        for (name, labels), value in counters.items():
+            samples.setdefault(name, []).append((labels, value))
+        for name, labels, value in self._model_samples():
+            samples.setdefault(name, []).append((labels, value))
+        batcher_gauges, batcher_histograms = self._micro_batcher_samples()
+        for name, labels, value in batcher_gauges:
+            samples.setdefault(name, []).append((labels, value))
+        from end_to_end_project.utils.log_handlers import dropped_log_records
+        dropped = dropped_log_records()
+        if dropped is not None:
+            samples["serving_log_records_dropped_total"] = [((), dropped)]
+
+        by_name = {}
+        for (name, labels), values in histograms.items():
+            by_name.setdefault(name, []).append((labels, list(self.buckets), values[:-1], values[-1]))
+        for name, (bounds, counts, total) in batcher_histograms.items():
+            by_name.setdefault(name, []).append(((), bounds, counts, total))
+
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            if name not in samples and name not in by_name:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(samples.get(name, [])):
+                lines.append(f"{name}{_labels(labels)} {_format_value(value)}")
+            for labels, bounds, counts, total in sorted(by_name.get(name, []), key=lambda entry: entry[0]):
+                cumulative = 0
+                for bound, count in zip(bounds + ["+Inf"], counts):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else _format_value(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {_format_value(total)}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+serving_metrics = ServingMetrics()
@@ -1,6 +1,6 @@
 from end_to_end_project.config.configuration import ConfigurationManager
 from end_to_end_project.components.data_ingestion import DataIngestion
-from end_to_end_project import logger
+from end_to_end_project import logger, setup_logging
 
 STAGE_NAME = "Data Ingestion Stage"
 
@@ -16,6 +16,7 @@ class DataIngestionPipeline:
         data_ingestion.extract_zip_file()
 
 if __name__ == "__main__":
+    setup_logging(ConfigurationManager().get_logging_config())
     try:
         logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
         obj = DataIngestionPipeline()
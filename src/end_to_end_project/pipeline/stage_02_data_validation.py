@@ -1,6 +1,6 @@
 from end_to_end_project.config.configuration import ConfigurationManager
 from end_to_end_project.components.data_validation import DataValidation
-from end_to_end_project import logger
+from end_to_end_project import logger, setup_logging
 
 STAGE_NAME = "Data Validation Stage"
 
@@ -15,6 +15,7 @@ class DataValidationPipeline:
         data_validation.validate_all_columns()
 
 if __name__ == "__main__":
+    setup_logging(ConfigurationManager().get_logging_config())
     try:
         logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
         obj = DataValidationPipeline()
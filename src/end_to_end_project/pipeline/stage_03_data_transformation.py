@@ -1,6 +1,8 @@
 from end_to_end_project.config.configuration import ConfigurationManager
 from end_to_end_project.components.data_transformation import DataTransformation
-from end_to_end_project import logger
+from end_to_end_project.components.streaming_transformation import OutOfCoreTransformation
+from end_to_end_project.utils.archive import open_source
+from end_to_end_project import logger, setup_logging
 import pandas as pd
 
 STAGE_NAME = "Data Transformation"
@@ -12,10 +14,16 @@ class DataTransformationPipeline:
     def main(self):
         config = ConfigurationManager()
         data_transformation_config = config.get_data_transformation_config()
-        data_transformation = DataTransformation(df=pd.read_csv(data_transformation_config.data_path), config=data_transformation_config)
+        if data_transformation_config.mode == "out_of_core":
+            OutOfCoreTransformation(config=data_transformation_config).run(do_clean=True, do_outliers=False)
+            return
+        with open_source(data_transformation_config.data_path) as source:
+            df = pd.read_csv(source)
+        data_transformation = DataTransformation(df=df, config=data_transformation_config)
         data_transformation.run_data_transformation(do_clean=True, do_split=True, do_outliers=False, do_skewness=False, do_imbalanced=False)
 
 if __name__ == "__main__":
+    setup_logging(ConfigurationManager().get_logging_config())
     try:
         logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
         obj = DataTransformationPipeline()
@@ -1,6 +1,7 @@
 from end_to_end_project.config.configuration import ConfigurationManager
 from end_to_end_project.components.model_training import ModelTraining
-from end_to_end_project import logger
+from end_to_end_project.components.model_tuning import ModelTuning
+from end_to_end_project import logger, setup_logging
 
 STAGE_NAME = "Model Training Stage"
 
@@ -10,11 +11,20 @@ class ModelTrainingPipeline:
 
     def main(self):
         config = ConfigurationManager()
+        model_tuning_config = config.get_model_tuning_config()
+        if model_tuning_config.enabled:
+            model_tuning = ModelTuning(config=model_tuning_config)
+            report = model_tuning.run_sweep()
+            model_tuning.save_results(report)
+            model_tuning.update_params(report)
+            # pick up the alpha / l1_ratio the sweep just wrote
+            config = ConfigurationManager()
         model_training_config = config.get_model_training_config()
         model_training = ModelTraining(config=model_training_config)
         model_training.train_model()
     
 if __name__ == "__main__":
+    setup_logging(ConfigurationManager().get_logging_config())
     try:
         logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
         obj = ModelTrainingPipeline()
@@ -1,6 +1,6 @@
 from end_to_end_project.config.configuration import ConfigurationManager
 from end_to_end_project.components.model_evaluation import ModelEvaluation
-from end_to_end_project import logger
+from end_to_end_project import logger, setup_logging
 
 STAGE_NAME = "Model Evaluation Stage"
 
@@ -12,9 +12,10 @@ class ModelEvaluationPipeline:
         config = ConfigurationManager()
         model_evaluation_config = config.get_model_evaluation_config()
         model_evaluation = ModelEvaluation(config=model_evaluation_config)
-        model_evaluation.log_into_mlflow()
+        model_evaluation.log_evaluation()
 
 if __name__ == "__main__":
+    setup_logging(ConfigurationManager().get_logging_config())
     try:
         logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
         obj = ModelEvaluationPipeline()
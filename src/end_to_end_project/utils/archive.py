@@ -0,0 +1,106 @@
+import os
+import tarfile
+import zipfile
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path, PurePosixPath
+from typing import Optional
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+
+def is_archive(path) -> bool:
+    return str(path).lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def split_archive_path(path) -> Optional[tuple]:
+    """
+    Split a path that goes through an archive into the archive and the member
+
+    Args:
+        path: e.g. artifacts/data_ingestion/data.zip/winequality-red.csv
+
+    Returns:
+        tuple: (Path of the archive, member name), None for a plain path
+    """
+    parts = Path(path).parts
+    for i, part in enumerate(parts[:-1]):
+        if is_archive(part):
+            return Path(*parts[:i + 1]), str(PurePosixPath(*parts[i + 1:]))
+    return None
+
+
+def member_signatures(archive: Path) -> dict:
+    """
+    Signature of every file in an archive, read from its index without decompressing anything
+
+    zip members are identified by their CRC-32 and size, tar members (which
+    carry no data checksum) by size, mtime and header checksum.
+    """
+    if zipfile.is_zipfile(archive):
+        with zipfile.ZipFile(archive) as zf:
+            return {info.filename: f"crc32:{info.CRC:08x}:{info.file_size}" for info in zf.infolist() if not info.is_dir()}
+    with tarfile.open(archive, "r:*") as tf:
+        return {m.name: f"tar:{m.size}:{int(m.mtime)}:{m.chksum}" for m in tf.getmembers() if m.isfile()}
+
+
+def source_signature(path) -> Optional[str]:
+    """Signature of the archive member a path points into, 'missing' when it doesn't exist, None for a plain path."""
+    split = split_archive_path(path)
+    if split is None:
+        return None
+    archive, member = split
+    if not archive.is_file():
+        return "missing"
+    return member_signatures(archive).get(member, "missing")
+
+
+@contextmanager
+def open_source(path):
+    """
+    Something `pd.read_csv` can read, for a plain file or a member inside an archive
+
+    Members are streamed out of the archive as they are read, nothing is
+    written to disk. A plain path is handed back untouched, so pandas still
+    infers compression for files like data.csv.gz.
+    """
+    split = split_archive_path(path)
+    if split is None:
+        yield path
+        return
+    archive, member = split
+    if zipfile.is_zipfile(archive):
+        with zipfile.ZipFile(archive) as zf, zf.open(member) as f:
+            yield f
+    else:
+        with tarfile.open(archive, "r:*") as tf:
+            f = tf.extractfile(member)
+            if f is None:
+                raise FileNotFoundError(f"{member} is not a file in {archive}")
+            with f:
+                yield f
+
+
+def extract_members(archive: Path, members: list, dest_dir: Path):
+    """
+    Extract some members of an archive
+
+    Each member is written to a temp directory next to its target and renamed
+    into place, so readers never see a half-written file.
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=dest_dir) as tmp_dir:
+        if zipfile.is_zipfile(archive):
+            with zipfile.ZipFile(archive) as zf:
+                for member in members:
+                    zf.extract(member, tmp_dir)
+        else:
+            # the safe extraction filter exists from Python 3.12 (and late 3.8-3.11 patch releases)
+            options = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+            with tarfile.open(archive, "r:*") as tf:
+                for member in members:
+                    tf.extract(member, tmp_dir, **options)
+        for member in members:
+            target = os.path.join(dest_dir, member)
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            os.replace(os.path.join(tmp_dir, member), target)
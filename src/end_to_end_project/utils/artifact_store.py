@@ -0,0 +1,111 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Optional
+from end_to_end_project import logger
+
+
+def _key(path) -> str:
+    return os.path.normpath(str(path))
+
+
+class DiskArtifactStore:
+    """Artifacts are written when they are put and read back from disk on get, what a stage run on its own does."""
+
+    def put(self, path, value: Any, save: Callable[[Any, Path], Any]):
+        save(value, Path(path))
+
+    def get(self, path, load: Callable[[Path], Any]) -> Any:
+        return load(Path(path))
+
+    def has_pending(self) -> bool:
+        return False
+
+    def wait(self, paths: Optional[list] = None):
+        pass
+
+    def close(self):
+        pass
+
+
+class MemoryArtifactStore:
+    """
+    Hands artifacts from stage to stage by reference, for stages running in one process.
+
+    `put` keeps the value under its configured path, so a later `get` of that
+    path returns the object itself instead of reading the file back; paths
+    nothing was put under are loaded from disk. Persisting goes through the
+    `save` function given with the value, either on a background thread right
+    away (`persist="async"`, one thread so writes keep their order) or only
+    when `wait` or `close` is called (`persist="end"`). Values are shared,
+    not copied, so nothing may modify what it gets. Only the thread running
+    the stages calls the store.
+    """
+
+    def __init__(self, persist: str = "async"):
+        if persist not in ("async", "end"):
+            raise ValueError(f"Unknown persist mode '{persist}', expected async or end")
+        self.persist = persist
+        self._values = {}
+        # key: (path, Future) for async writes, (path, (save, value)) for deferred ones
+        self._pending = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifact-writer") if persist == "async" else None
+
+    def put(self, path, value: Any, save: Callable[[Any, Path], Any]):
+        # a second put of the same path must not race the first write
+        self.wait([path])
+        key = _key(path)
+        self._values[key] = value
+        if self.persist == "async":
+            self._pending[key] = (Path(path), self._executor.submit(save, value, Path(path)))
+        else:
+            self._pending[key] = (Path(path), (save, value))
+
+    def get(self, path, load: Callable[[Path], Any]) -> Any:
+        key = _key(path)
+        if key in self._values:
+            return self._values[key]
+        return load(Path(path))
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def wait(self, paths: Optional[list] = None):
+        """Make sure the artifacts at `paths` (default: all of them) are on disk; re-raises the first failed write."""
+        keys = list(self._pending) if paths is None else [key for key in map(_key, paths) if key in self._pending]
+        errors = []
+        for key in keys:
+            path, pending = self._pending.pop(key)
+            try:
+                if isinstance(pending, Future):
+                    pending.result()
+                else:
+                    save, value = pending
+                    save(value, path)
+            except Exception as e:
+                logger.error(f"Failed to persist artifact {path}: {e}")
+                errors.append(e)
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+            self._values.clear()
+
+
+_store = DiskArtifactStore()
+
+
+def get_artifact_store():
+    return _store
+
+
+def set_artifact_store(store):
+    """Make `store` the one components put to and get from; returns the store it replaces."""
+    global _store
+    previous, _store = _store, store
+    return previous
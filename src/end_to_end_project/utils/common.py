@@ -3,7 +3,7 @@ from box.exceptions import BoxValueError
 import yaml
 from end_to_end_project import logger
 import json
-import joblib
+import hashlib
 from typeguard import typechecked
 from box import ConfigBox
 from pathlib import Path
@@ -11,12 +11,13 @@ from typing import Any
 
 
 @typechecked
-def read_yaml(path_to_yaml: Path) -> ConfigBox:
+def read_yaml(path_to_yaml: Path, frozen: bool = False) -> ConfigBox:
     """
     Reads a YAML file and returns a ConfigBox
     
     Args:
         path_to_yaml (Path): Path to the YAML file
+        frozen (bool, optional): return an immutable ConfigBox (lists become tuples). Defaults to False
     
     Returns:
         ConfigBox: ConfigBox containing the YAML data
@@ -25,7 +26,7 @@ def read_yaml(path_to_yaml: Path) -> ConfigBox:
         with open(path_to_yaml) as yaml_file:
             content = yaml.safe_load(yaml_file)
             logger.info(f"YAML file: {path_to_yaml} loaded successfully")
-            return ConfigBox(content)
+            return ConfigBox(content, frozen_box=frozen)
     except BoxValueError:
         raise ValueError(f"YAML file is empty")
     except Exception as e:
@@ -85,6 +86,7 @@ def save_bin(data: Any, path: Path):
         data (Any): data to be saved as binary
         path (Path): path to save the binary file
     """
+    import joblib
     joblib.dump(value=data, filename=path)
     logger.info(f"Binary file saved at: {path}")
 
@@ -99,6 +101,7 @@ def load_bin(path: Path) -> Any:
     Returns:
         Any: data loaded from the binary file
     """
+    import joblib
     data = joblib.load(filename=path)
     logger.info(f"Binary file loaded successfully from: {path}")
     return data
@@ -115,4 +118,18 @@ def get_size(path: Path) -> str:
         int: size of the file in bytes
     """
     size_in_kb = os.path.getsize(path) / 1024
-    return f"{size_in_kb} KB"
\ No newline at end of file
+    return f"{size_in_kb} KB"
+
+@typechecked
+def get_schema_hash(schema: dict) -> str:
+    """
+    Get a stable hash of the column names, their order and their dtypes
+
+    Args:
+        schema (dict): column name to dtype mapping (the COLUMNS section of schema.yaml)
+
+    Returns:
+        str: sha256 hex digest of the schema
+    """
+    content = json.dumps([[str(col), str(dtype)] for col, dtype in schema.items()])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
@@ -0,0 +1,290 @@
+import os
+import json
+import shutil
+import struct
+import numpy as np
+from pathlib import Path
+from typing import TYPE_CHECKING
+from end_to_end_project import logger
+from end_to_end_project.utils.artifact_store import get_artifact_store
+
+if TYPE_CHECKING:
+    # imported where a dataset is actually read, so path helpers stay cheap to import
+    import pandas as pd
+
+FORMATS = ("csv", "npy", "parquet", "feather")
+# when several copies of a dataset exist the binary ones win, csv is only an export then
+READ_PREFERENCE = ("npy", "parquet", "feather", "csv")
+
+
+def dataset_path(path: Path, fmt: str) -> Path:
+    """
+    Location of a dataset in a given format, derived from its configured (.csv) path
+
+    Args:
+        path (Path): configured path, e.g. artifacts/data_transformation/train.csv
+        fmt (str): one of csv, npy, parquet, feather
+
+    Returns:
+        Path: train.csv, train/ (npy directory), train.parquet or train.feather
+    """
+    path = Path(path)
+    stem = path.with_suffix("")
+    if fmt == "npy":
+        return stem
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown artifact format '{fmt}', expected one of {FORMATS}")
+    return stem.with_suffix(f".{fmt}")
+
+
+def resolve_dataset_path(path: Path) -> Path:
+    """Existing copy of a dataset, in read preference order; the configured path if there is none."""
+    for fmt in READ_PREFERENCE:
+        candidate = dataset_path(path, fmt)
+        if fmt == "npy" and not (candidate / "meta.json").exists():
+            continue
+        if candidate.exists():
+            return candidate
+    return Path(path)
+
+
+def detect_format(path: Path) -> str:
+    path = Path(path)
+    if path.is_dir():
+        return "npy"
+    suffix = path.suffix.lstrip(".").lower()
+    return suffix if suffix in FORMATS else "csv"
+
+
+def schema_dtypes(schema: dict, float32: bool = False) -> dict:
+    dtypes = {col: str(dtype) for col, dtype in schema.items()}
+    if float32:
+        dtypes = {col: "float32" if dtype.startswith("float") else dtype for col, dtype in dtypes.items()}
+    return dtypes
+
+
+def _remove(path: Path):
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
+
+
+class _NpyColumnWriter:
+    """
+    Appends rows to a .npy file whose length is only known at the end.
+
+    The header is written with a fixed, padded size and rewritten in place on
+    close with the final shape, so the data is never copied a second time.
+    """
+
+    HEADER_SIZE = 128  # magic + version + length + dict, keeps the data 64-byte aligned
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.file = open(path, "wb")
+        self.dtype = None
+        self.trailing_shape = None
+        self.rows = 0
+        self.file.write(b"\0" * self.HEADER_SIZE)
+
+    def write(self, array: np.ndarray):
+        if self.dtype is None:
+            self.dtype, self.trailing_shape = array.dtype, array.shape[1:]
+        self.file.write(np.ascontiguousarray(array, dtype=self.dtype).tobytes())
+        self.rows += len(array)
+
+    def close(self):
+        dtype = self.dtype if self.dtype is not None else np.dtype(np.float64)
+        shape = (self.rows,) + (self.trailing_shape or ())
+        header = np.lib.format.magic(1, 0)
+        literal = repr({"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": shape})
+        padding = self.HEADER_SIZE - len(header) - 2 - len(literal) - 1
+        header += struct.pack("<H", self.HEADER_SIZE - len(header) - 2) + (literal + " " * padding + "\n").encode("latin1")
+        self.file.seek(0)
+        self.file.write(header)
+        self.file.close()
+
+
+class DatasetWriter:
+    """
+    Writes a dataset chunk by chunk in any of the artifact formats
+
+    Every chunk is cast to the schema dtypes and appended: npy arrays are
+    streamed to disk (see `_NpyColumnWriter`), parquet and feather go through
+    pyarrow's row-group / record-batch writers and csv is appended as text, so
+    only one chunk is ever held in memory.
+
+    Args:
+        path (Path): configured (.csv) path of the dataset
+        target (str): name of the target column
+        schema (dict): column name to dtype mapping (schema.yaml COLUMNS)
+        fmt (str): csv, npy (memory-mappable features/target arrays), parquet or feather
+        float32 (bool): store float features as float32
+        export_csv (bool): also write a csv copy next to a binary artifact
+    """
+
+    def __init__(self, path: Path, target: str, schema: dict, fmt: str = "csv",
+                 float32: bool = False, export_csv: bool = False):
+        self.path = Path(path)
+        self.target = target
+        self.fmt = fmt
+        self.export_csv = export_csv and fmt != "csv"
+        self.dtypes = schema_dtypes(schema, float32)
+        self.out = dataset_path(path, fmt)
+        self.rows = 0
+        self.columns = None
+        self._writer = None
+
+        # stale copies in other formats would shadow this one on read, and the csv
+        # target / export is appended chunk by chunk, so an old one goes too
+        for other in FORMATS:
+            _remove(dataset_path(path, other))
+
+    def write(self, df: "pd.DataFrame"):
+        df = df.astype({col: dtype for col, dtype in self.dtypes.items() if col in df.columns})
+        if self.columns is None:
+            self.columns = list(df.columns)
+            self._open(df)
+        df = df[self.columns]
+
+        if self.fmt == "csv":
+            df.to_csv(self.out, mode="a", header=self.rows == 0, index=False)
+        elif self.fmt == "npy":
+            features, target = self._writer
+            features.write(df[self.features].to_numpy())
+            target.write(df[self.target].to_numpy())
+        else:
+            import pyarrow as pa
+            self._writer.write_table(pa.Table.from_pandas(df, schema=self._schema, preserve_index=False))
+
+        if self.export_csv:
+            df.to_csv(dataset_path(self.path, "csv"), mode="a", header=self.rows == 0, index=False)
+        self.rows += len(df)
+
+    def _open(self, df: "pd.DataFrame"):
+        if self.fmt == "npy":
+            self.features = [col for col in df.columns if col != self.target]
+            os.makedirs(self.out)
+            self._writer = (_NpyColumnWriter(self.out / "features.npy"), _NpyColumnWriter(self.out / "target.npy"))
+            self._meta = {"features": self.features, "target": self.target,
+                          "dtypes": {col: str(df[col].dtype) for col in df.columns}}
+        elif self.fmt in ("parquet", "feather"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            self._schema = pa.Schema.from_pandas(df, preserve_index=False)
+            if self.fmt == "parquet":
+                self._writer = pq.ParquetWriter(self.out, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(str(self.out), self._schema)
+
+    def close(self) -> Path:
+        if self.columns is None:
+            raise ValueError(f"No rows were written to {self.out}")
+        if self.fmt == "npy":
+            for writer in self._writer:
+                writer.close()
+            with open(self.out / "meta.json", "w") as f:
+                json.dump({**self._meta, "rows": self.rows}, f, indent=4)
+        elif self._writer is not None:
+            self._writer.close()
+        logger.info(f"Dataset saved at: {self.out} ({self.fmt}, {self.rows} rows)")
+        return self.out
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+
+def save_dataset(df: "pd.DataFrame", path: Path, target: str, schema: dict, fmt: str = "csv",
+                 float32: bool = False, export_csv: bool = False) -> Path:
+    """
+    Save a dataset with the dtypes declared in the schema
+
+    Args:
+        df (pd.DataFrame): features and target
+        path (Path): configured (.csv) path of the dataset
+        target (str): name of the target column
+        schema (dict): column name to dtype mapping (schema.yaml COLUMNS)
+        fmt (str): csv, npy (memory-mappable features/target arrays), parquet or feather
+        float32 (bool): store float features as float32
+        export_csv (bool): also write a csv copy next to a binary artifact
+
+    Returns:
+        Path: where the dataset was written
+    """
+    with DatasetWriter(path, target, schema, fmt=fmt, float32=float32, export_csv=export_csv) as writer:
+        writer.write(df)
+    return writer.out
+
+
+def put_dataset(df: "pd.DataFrame", path: Path, target: str, schema: dict, fmt: str = "csv",
+                float32: bool = False, export_csv: bool = False):
+    """
+    `save_dataset` through the active artifact store
+
+    The store keeps (features, target) cast to the schema dtypes, exactly what
+    `get_xy` would read back from disk, so a later stage of the same run gets
+    the DataFrames themselves while the file is written by the store.
+    """
+    df = df.astype({col: dtype for col, dtype in schema_dtypes(schema, float32).items() if col in df.columns})
+    get_artifact_store().put(path, (df.drop(columns=[target]), df[target]),
+                             save=lambda _, path: save_dataset(df, path, target, schema, fmt=fmt, float32=float32,
+                                                               export_csv=export_csv))
+
+
+def load_xy(path: Path, target: str, schema: dict, mmap: bool = True):
+    """
+    Load features and target of a dataset, whatever format it was saved in
+
+    The npy format is opened memory-mapped and wrapped without copying, so the
+    features are paged in lazily and shared with the OS page cache.
+
+    Args:
+        path (Path): configured (.csv) path of the dataset
+        target (str): name of the target column
+        schema (dict): column name to dtype mapping, used for csv reads
+        mmap (bool): memory-map npy artifacts
+
+    Returns:
+        tuple: (features DataFrame, target Series)
+    """
+    path = resolve_dataset_path(path)
+    fmt = detect_format(path)
+    if fmt == "npy":
+        with open(path / "meta.json") as f:
+            meta = json.load(f)
+        mmap_mode = "r" if mmap else None
+        X = np.load(path / "features.npy", mmap_mode=mmap_mode)
+        y = np.load(path / "target.npy", mmap_mode=mmap_mode)
+        import pandas as pd
+        return pd.DataFrame(X, columns=meta["features"], copy=False), pd.Series(y, name=meta["target"], copy=False)
+
+    df = load_dataset(path, schema)
+    return df.drop(columns=[target]), df[target]
+
+
+def get_xy(path: Path, target: str, schema: dict, mmap: bool = True):
+    """`load_xy` through the active artifact store: the DataFrames an earlier stage of this run put, else the file."""
+    return get_artifact_store().get(path, load=lambda path: load_xy(path, target, schema, mmap=mmap))
+
+
+def load_dataset(path: Path, schema: dict, mmap: bool = True) -> "pd.DataFrame":
+    """Load a whole dataset (features and target) as one DataFrame."""
+    path = resolve_dataset_path(path)
+    fmt = detect_format(path)
+    if fmt == "npy":
+        with open(path / "meta.json") as f:
+            meta = json.load(f)
+        X, y = load_xy(path, meta["target"], schema, mmap=mmap)
+        return X.assign(**{meta["target"]: y})
+    import pandas as pd
+    if fmt == "csv":
+        columns = pd.read_csv(path, nrows=0).columns
+        return pd.read_csv(path, dtype={col: dtype for col, dtype in schema_dtypes(schema).items() if col in columns})
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    return pd.read_feather(path)
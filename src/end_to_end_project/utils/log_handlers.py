@@ -0,0 +1,160 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from datetime import datetime, timezone
+from typing import Optional
+
+# attributes every LogRecord has; anything else on a record came in through `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, module, message, exception, plus any `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+            "process": record.process,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a bounded queue instead of formatting and writing them.
+
+    With `full_policy="drop"` a record that finds the queue full is counted in
+    `dropped` and discarded, so logging never waits; with "block" the caller
+    waits for room. In a forked child (process pool workers) the listener
+    thread doesn't exist, so records go straight to the handlers there.
+    """
+
+    def __init__(self, log_queue: queue.Queue, full_policy: str = "drop"):
+        if full_policy not in ("drop", "block"):
+            raise ValueError(f"Unknown full_policy '{full_policy}', expected drop or block")
+        super().__init__(log_queue)
+        self.full_policy = full_policy
+        self.dropped = 0
+        self.listener: Optional["LogListener"] = None
+        self._pid = os.getpid()
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # merge the arguments and render the traceback now, the formatters on the
+        # other side still see the exception as exc_text (the stock prepare folds it into msg)
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.full_policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def emit(self, record: logging.LogRecord):
+        if os.getpid() != self._pid and self.listener is not None:
+            self.listener.handle(record)
+            return
+        super().emit(record)
+
+
+class LogListener(logging.handlers.QueueListener):
+    """Runs the handlers on a background thread; logs a warning with the count whenever records were dropped."""
+
+    def __init__(self, log_queue: queue.Queue, handlers: list, queue_handler: BoundedQueueHandler):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self._reported = 0
+
+    def _report_dropped(self):
+        dropped = self.queue_handler.dropped
+        if dropped > self._reported:
+            warning = logging.makeLogRecord({
+                "name": "end_to_end_project", "levelno": logging.WARNING, "levelname": "WARNING", "module": "log_handlers",
+                "msg": f"{dropped - self._reported} log records dropped, the log queue was full ({dropped} since start)"
+            })
+            self._reported = dropped
+            super().handle(warning)
+
+    def handle(self, record: logging.LogRecord):
+        self._report_dropped()
+        super().handle(record)
+
+    def stop(self):
+        super().stop()
+        # drops after the last record that went through
+        self._report_dropped()
+
+    def enqueue_sentinel(self):
+        # the stock put_nowait fails when the queue is full, wait for room instead
+        self.queue.put(self._sentinel)
+
+
+def build_handlers(log_file: str, fmt: str = "text", max_bytes: int = 0, backup_count: int = 0,
+                   rotate_when: Optional[str] = None, text_format: Optional[str] = None) -> list:
+    """File and stdout handlers; the file rotates on `rotate_when` (e.g. "midnight") if set, else past `max_bytes` if > 0."""
+    if fmt == "json":
+        formatter = JsonFormatter()
+    elif fmt == "text":
+        formatter = logging.Formatter(text_format)
+    else:
+        raise ValueError(f"Unknown log format '{fmt}', expected text or json")
+
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+    if rotate_when:
+        file_handler = logging.handlers.TimedRotatingFileHandler(log_file, when=rotate_when, backupCount=backup_count)
+    elif max_bytes:
+        file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
+    else:
+        file_handler = logging.FileHandler(log_file)
+    handlers = [file_handler, logging.StreamHandler(sys.stdout)]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def start_queue_logging(handlers: list, queue_size: int, full_policy: str) -> BoundedQueueHandler:
+    """Queue handler for the root logger, with a started listener that is stopped (and drained) at exit."""
+    log_queue = queue.Queue(maxsize=queue_size)
+    queue_handler = BoundedQueueHandler(log_queue, full_policy=full_policy)
+    listener = LogListener(log_queue, handlers, queue_handler)
+    queue_handler.listener = listener
+    listener.start()
+    atexit.register(listener.stop)
+    return queue_handler
+
+
+def dropped_log_records() -> Optional[int]:
+    """Records dropped by the root logger's queue handler so far, None when logging isn't queued."""
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, BoundedQueueHandler):
+            return handler.dropped
+    return None
@@ -0,0 +1,205 @@
+import os
+import time
+import resource
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Optional
+from end_to_end_project import logger
+
+STATUS_FILE = "/proc/self/status"
+CLEAR_REFS_FILE = "/proc/self/clear_refs"
+
+
+def _read_status_kb(field: str) -> Optional[int]:
+    try:
+        with open(STATUS_FILE) as f:
+            return next((int(line.split()[1]) for line in f if line.startswith(field)), None)
+    except OSError:
+        return None
+
+
+def _reset_peak_rss() -> bool:
+    # Linux: writing 5 resets VmHWM to the current RSS
+    try:
+        with open(CLEAR_REFS_FILE, "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_kb() -> int:
+    peak = _read_status_kb("VmHWM")
+    # elsewhere the process-lifetime peak is the best there is
+    return peak if peak is not None else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _cpu_seconds() -> float:
+    # worker processes (process pools) are counted once they have been joined
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def path_bytes(path) -> int:
+    """Size of a file, or of every file under a directory; 0 when missing."""
+    path = str(path)
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+
+def count_rows(value) -> Optional[int]:
+    """Rows of a DataFrame / array, summed over tuples and lists; None for anything else."""
+    if isinstance(value, (tuple, list)):
+        counts = [count_rows(item) for item in value]
+        counts = [count for count in counts if count is not None]
+        return sum(counts) if counts else None
+    shape = getattr(value, "shape", None)
+    return int(shape[0]) if shape else None
+
+
+class Profiler:
+    """
+    Nested wall time, CPU time, peak RSS and row counts of pipeline stages and their steps.
+
+    `profile(name)` opens a record under the innermost open one. Peak RSS
+    is exact per record on Linux: the kernel high-water mark is reset when
+    a record opens, and the peak seen so far is first handed to every
+    enclosing record so resetting doesn't lose it. Records are plain dicts,
+    ready to be dumped as JSON.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self.records = []
+
+    @property
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def current(self) -> Optional[dict]:
+        stack = self._stack
+        return stack[-1]["record"] if stack else None
+
+    def set_rows(self, rows_in: Optional[int] = None, rows_out: Optional[int] = None):
+        """Row counts of the innermost open record, for code that knows them better than the decorator."""
+        record = self.current()
+        if record is None:
+            return
+        if rows_in is not None:
+            record["rows_in"] = int(rows_in)
+        if rows_out is not None:
+            record["rows_out"] = int(rows_out)
+
+    @contextmanager
+    def profile(self, name: str, rows_in: Optional[int] = None, artifacts=None):
+        """
+        Args:
+            artifacts: paths whose size is recorded on exit, or a callable returning them
+        """
+        stack = self._stack
+        peak = _peak_rss_kb()
+        for frame in stack:
+            frame["peak_kb"] = max(frame["peak_kb"], peak)
+        exact = _reset_peak_rss()
+
+        record = {"name": name, "wall_seconds": None, "cpu_seconds": None, "peak_rss_mb": None,
+                  "rss_start_mb": (_read_status_kb("VmRSS") or 0) / 1024, "peak_rss_exact": exact,
+                  "rows_in": rows_in, "rows_out": None, "artifact_bytes": None, "status": "ok", "steps": []}
+        frame = {"record": record, "peak_kb": 0}
+        if stack:
+            stack[-1]["record"]["steps"].append(record)
+        else:
+            self.records.append(record)
+        stack.append(frame)
+
+        cpu_start = _cpu_seconds()
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException:
+            record["status"] = "failed"
+            raise
+        finally:
+            record["wall_seconds"] = time.perf_counter() - start
+            record["cpu_seconds"] = _cpu_seconds() - cpu_start
+            record["peak_rss_mb"] = max(frame["peak_kb"], _peak_rss_kb()) / 1024
+            if artifacts is not None:
+                paths = artifacts() if callable(artifacts) else artifacts
+                record["artifact_bytes"] = {str(path): path_bytes(path) for path in paths}
+            stack.pop()
+            if stack:
+                stack[-1]["peak_kb"] = max(stack[-1]["peak_kb"], frame["peak_kb"], _peak_rss_kb())
+
+    def take(self) -> list:
+        records, self.records = self.records, []
+        return records
+
+
+profiler = Profiler()
+
+
+def profiled(name: Optional[str] = None):
+    """
+    Profile every call of a method as a step of the enclosing record
+
+    Rows in are counted from the DataFrame / array arguments, or from
+    `self.df` for methods that take none; rows out from the return value.
+    """
+    def decorator(func):
+        step_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            rows_in = count_rows(list(args) + list(kwargs.values()))
+            if rows_in is None:
+                rows_in = count_rows(getattr(self, "df", None))
+            with profiler.profile(step_name, rows_in=rows_in) as record:
+                result = func(self, *args, **kwargs)
+                record["rows_out"] = count_rows(result)
+                return result
+        return wrapper
+    return decorator
+
+
+def compare_reports(previous: dict, current: dict) -> list:
+    """
+    Stage by stage (and step by step) change between two run reports
+
+    Returns:
+        list: one dict per record present in both, with both values and the ratio of wall time and peak RSS
+    """
+    def flatten(records, prefix=""):
+        for record in records:
+            key = f"{prefix}{record['name']}"
+            yield key, record
+            yield from flatten(record.get("steps", []), prefix=f"{key}/")
+
+    before = dict(flatten(previous.get("stages", [])))
+    rows = []
+    for key, record in flatten(current.get("stages", [])):
+        old = before.get(key)
+        if old is None or record.get("wall_seconds") is None or old.get("wall_seconds") is None:
+            continue
+        rows.append({
+            "name": key,
+            "wall_seconds": [old["wall_seconds"], record["wall_seconds"]],
+            "wall_ratio": record["wall_seconds"] / old["wall_seconds"] if old["wall_seconds"] else None,
+            "peak_rss_mb": [old["peak_rss_mb"], record["peak_rss_mb"]],
+            "peak_rss_ratio": record["peak_rss_mb"] / old["peak_rss_mb"] if old["peak_rss_mb"] else None,
+            "rows_out": [old.get("rows_out"), record.get("rows_out")]
+        })
+    return rows
+
+
+def log_comparison(rows: list):
+    for row in rows:
+        (old_wall, new_wall), (old_peak, new_peak) = row["wall_seconds"], row["peak_rss_mb"]
+        logger.info(f"{row['name']:<45} wall {old_wall:8.3f} -> {new_wall:8.3f} s   peak RSS {old_peak:7.0f} -> {new_peak:7.0f} MB")
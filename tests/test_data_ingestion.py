@@ -0,0 +1,161 @@
+import io
+import os
+import json
+import time
+import socket
+import zipfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from end_to_end_project.components.data_ingestion import DataIngestion
+from end_to_end_project.entity.config_entity import DataIngestionConfig
+
+
+def make_archive(seed: int) -> bytes:
+    # stored, not deflated, so the archive is large enough to cut in the middle
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        archive.writestr("winequality-red.csv", bytes((seed + i) % 251 for i in range(200_000)))
+    return buffer.getvalue()
+
+
+class SourceHandler(BaseHTTPRequestHandler):
+    """Serves `server.body` with an ETag, answers conditional and If-Range requests, cuts a transfer on demand."""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        start = 0
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range") in (server.etag, server.last_modified):
+            start = int(range_header.split("=", 1)[1].rstrip("-"))
+        payload = server.body[start:]
+        self.send_response(206 if start else 200)
+        self.send_header("ETag", server.etag)
+        if server.last_modified:
+            self.send_header("Last-Modified", server.last_modified)
+        self.send_header("Content-Length", str(len(payload)))
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{len(server.body) - 1}/{len(server.body)}")
+        self.end_headers()
+
+        if server.cut_next:
+            # send half of the body and drop the connection
+            server.cut_next = False
+            payload = payload[:len(payload) // 2]
+            self.close_connection = True
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def source():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SourceHandler)
+    server.body = make_archive(seed=1)
+    server.etag = '"v1"'
+    server.last_modified = None
+    server.cut_next = False
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_ingestion(source, tmp_path, sha256=None, port=None) -> DataIngestion:
+    config = DataIngestionConfig(
+        root_dir=tmp_path,
+        source_url=f"http://127.0.0.1:{port or source.server_address[1]}/data.zip",
+        local_data_file=str(tmp_path / "data.zip"),
+        unzip_dir=tmp_path,
+        sha256=sha256,
+        timeout=5,
+        retries=2,
+        extract=True,
+        fallback_timeout=0.5
+    )
+    return DataIngestion(config=config)
+
+
+def test_unchanged_source_answers_304(source, tmp_path):
+    ingestion = make_ingestion(source, tmp_path)
+    assert ingestion.download_file() is True
+    mtime = os.path.getmtime(tmp_path / "data.zip")
+
+    assert ingestion.download_file() is False
+    assert source.requests[-1]["If-None-Match"] == source.etag
+    assert os.path.getmtime(tmp_path / "data.zip") == mtime
+    assert (tmp_path / "data.zip").read_bytes() == source.body
+
+
+def test_cut_transfer_resumes_with_range(source, tmp_path):
+    ingestion = make_ingestion(source, tmp_path)
+    source.cut_next = True
+
+    # the first attempt breaks off halfway, the retry asks for the rest
+    assert ingestion.download_file() is True
+    assert len(source.requests) == 2
+    first, second = source.requests
+    assert "Range" not in first
+    assert second["Range"] == f"bytes={len(source.body) // 2}-"
+    assert second["If-Range"] == source.etag
+    assert (tmp_path / "data.zip").read_bytes() == source.body
+    assert not os.path.exists(ingestion.part_path)
+    assert not os.path.exists(ingestion.part_meta_path)
+
+
+def test_checksum_mismatch_keeps_published_copy(source, tmp_path):
+    published = make_archive(seed=2)
+    (tmp_path / "data.zip").write_bytes(published)
+    ingestion = make_ingestion(source, tmp_path, sha256="0" * 64)
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        ingestion.download_file()
+    assert not os.path.exists(ingestion.part_path)
+    assert (tmp_path / "data.zip").read_bytes() == published
+
+
+@pytest.mark.parametrize("last_modified", ["Tue, 06 Oct 2026 10:00:00 GMT", None])
+def test_weak_etag_is_not_sent_as_if_range(source, tmp_path, last_modified):
+    source.etag = 'W/"v1"'
+    source.last_modified = last_modified
+    ingestion = make_ingestion(source, tmp_path)
+    source.cut_next = True
+
+    assert ingestion.download_file() is True
+    second = source.requests[1]
+    if last_modified:
+        # resumed against the date instead
+        assert second["If-Range"] == last_modified
+        assert second["Range"] == f"bytes={len(source.body) // 2}-"
+    else:
+        # nothing strong to guard the range with, download it all again
+        assert "Range" not in second and "If-Range" not in second
+    assert (tmp_path / "data.zip").read_bytes() == source.body
+
+
+def test_unreachable_source_falls_back_to_local_copy_quickly(source, tmp_path):
+    ingestion = make_ingestion(source, tmp_path)
+    assert ingestion.download_file() is True
+
+    # a source that accepts the connection and never answers
+    with socket.socket() as silent:
+        silent.bind(("127.0.0.1", 0))
+        silent.listen()
+        offline = make_ingestion(source, tmp_path, port=silent.getsockname()[1])
+        start = time.perf_counter()
+        assert offline.download_file() is False
+        # one attempt with fallback_timeout, not retries x timeout
+        assert time.perf_counter() - start < 3
+    assert (tmp_path / "data.zip").read_bytes() == source.body
+    assert json.loads((tmp_path / "data.zip.meta.json").read_text())["etag"] == source.etag
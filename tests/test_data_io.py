@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+
+from end_to_end_project.utils.data_io import dataset_path, load_xy, save_dataset
+
+SCHEMA = {"alcohol": "float64", "pH": "float64", "quality": "int64"}
+
+
+def make_dataset(rows: int = 50) -> pd.DataFrame:
+    return pd.DataFrame({
+        "alcohol": [9.0 + i / 10 for i in range(rows)],
+        "pH": [3.0 + i / 100 for i in range(rows)],
+        "quality": [5 + i % 3 for i in range(rows)]
+    })
+
+
+@pytest.mark.parametrize("fmt, export_csv", [("csv", True), ("csv", False), ("npy", True), ("parquet", True)])
+def test_saving_twice_overwrites(tmp_path, fmt, export_csv):
+    df = make_dataset()
+    path = tmp_path / "train.csv"
+    for _ in range(2):
+        save_dataset(df, path, target="quality", schema=SCHEMA, fmt=fmt, export_csv=export_csv)
+
+    X, y = load_xy(path, target="quality", schema=SCHEMA)
+    assert len(X) == len(y) == len(df)
+    csv_path = dataset_path(path, "csv")
+    if fmt == "csv" or export_csv:
+        lines = csv_path.read_text().splitlines()
+        assert len(lines) == len(df) + 1
+        assert sum(line.startswith("alcohol,") for line in lines) == 1
+    else:
+        assert not csv_path.exists()
@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import PowerTransformer
+
+from end_to_end_project.components.data_transformation import DataTransformation
+
+
+def make_frames(rows: int = 2000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "chlorides": rng.lognormal(-2.5, 0.6, rows),
+        "residual sugar": rng.lognormal(0.8, 0.5, rows),
+        "pH": rng.normal(3.3, 0.15, rows),
+        "quality": rng.integers(3, 9, rows)
+    })
+    return df.iloc[:1500].reset_index(drop=True), df.iloc[1500:].reset_index(drop=True)
+
+
+def test_power_transform_state_matches_public_power_transformer():
+    train, test = make_frames()
+    config = SimpleNamespace(power_n_jobs=1, power_sample_size=None, power_tolerance=0.01)
+    transformation = DataTransformation(pd.concat([train, test]), config=config)
+    raw_test = test.copy()
+
+    train_out, test_out = transformation.handle_skewness_normalize(train.copy(), test.copy())
+    preprocessor = transformation.preprocessor
+    skewed = ["chlorides", "residual sugar"]
+    assert [preprocessor.feature_names[i] for i in preprocessor.skewed_idx] == skewed
+
+    # only the public surface of scikit-learn: lambdas_ and the transformed output
+    pt = PowerTransformer(method="yeo-johnson").fit(train[skewed])
+    np.testing.assert_allclose(preprocessor.lambdas, pt.lambdas_, rtol=1e-3)
+    np.testing.assert_allclose(train_out[skewed], pt.transform(train[skewed]), atol=1e-3)
+    np.testing.assert_allclose(test_out[skewed], pt.transform(test[skewed]), atol=1e-3)
+
+    # the saved state alone reproduces what training saw
+    features = raw_test.drop(columns="quality").to_numpy()
+    served = preprocessor.transform(features)
+    np.testing.assert_allclose(served, test_out.drop(columns="quality").to_numpy(), atol=1e-9)